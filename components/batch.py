@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence
+
+from components.checkpoint import CrawlFrontier
+from components.models import Author
+from components.resources import CrawlResources
+from components.scraper import TikTokScraper
+
+logger = logging.getLogger('apify_client')
+
+STAGES = ('video', 'author', 'comments', 'replies', 'sink')
+# Endpoint limit each pipeline stage's default worker count is derived from.
+STAGE_ENDPOINTS = {'video': 'profile', 'author': 'profile', 'comments': 'comment',
+                   'replies': 'reply', 'sink': 'sink'}
+
+
+class KeywordBatch:
+    """
+    Crawls several keywords concurrently in one process.
+
+    Every keyword has its own scraper and pipeline, all built on one set of
+    `CrawlResources`: the HTTP pool, traffic controls, author cache, influencer
+    dedup index and sinks are shared. Each keyword's stages get an equal share of
+    the endpoint limits, so a keyword with many results cannot starve the others.
+    """
+
+    def __init__(self,
+                 apify_client,
+                 keywords: Sequence[str],
+                 max_influencers: int = 100,
+                 max_workers: int = 10,
+                 concurrency: Optional[Dict[str, int]] = None,
+                 author_cache=None,
+                 sinks=('api',),
+                 stage_workers: Optional[Dict[str, int]] = None,
+                 frontiers: Optional[Dict[str, CrawlFrontier]] = None,
+                 **scraper_options,
+                 ):
+        """
+        :param apify_client: Dataset client used by the `dataset` sink
+        :param keywords: Search keywords
+        :param max_influencers: Maximum number of influencers over every keyword
+        :param max_workers: Base number of concurrent requests per endpoint
+        :param concurrency: Explicit limits for search, profile, comment, reply and sink traffic
+        :param author_cache: Shared author metadata cache
+        :param sinks: Output sinks
+        :param stage_workers: Worker count per pipeline stage of each keyword, a fair share of the limits otherwise
+        :param frontiers: Checkpointed crawl state per keyword
+        :param scraper_options: Further `TikTokScraper` arguments applied to every keyword
+        """
+        if not keywords:
+            raise ValueError("At least one keyword is required")
+        self.resources = CrawlResources(
+            apify_client, max_influencers=max_influencers, max_workers=max_workers,
+            concurrency=concurrency, author_cache=author_cache, sinks=sinks,
+            deadline=scraper_options.get('deadline')
+        )
+        keywords = list(dict.fromkeys(keywords))
+        share = stage_workers or self._fair_share(len(keywords))
+        frontiers = frontiers or {}
+        self.scrapers: List[TikTokScraper] = [
+            TikTokScraper(apify_client, keyword, max_influencers=max_influencers,
+                          stage_workers=share, frontier=frontiers.get(keyword),
+                          resources=self.resources, **scraper_options)
+            for keyword in keywords
+        ]
+
+    def _fair_share(self, keyword_count: int) -> Dict[str, int]:
+        limits = self.resources.governor.limits
+        return {stage: max(1, limits[STAGE_ENDPOINTS[stage]] // keyword_count) for stage in STAGES}
+
+    def frontiers(self) -> Dict[str, Dict]:
+        """
+        :return: Crawl frontier of every keyword, for checkpointing
+        """
+        return {scraper.kw: scraper.frontier.to_dict() for scraper in self.scrapers}
+
+    @staticmethod
+    async def _crawl(scraper: TikTokScraper) -> List[Author]:
+        async with scraper:
+            return await scraper.extract_influencers()
+
+    async def run(self) -> Dict[str, List[Author]]:
+        """
+        Crawl every keyword until the shared influencer limit is reached or all searches are exhausted.
+
+        :return: Extracted influencer data per keyword
+        """
+        async with self.resources:
+            results = await asyncio.gather(*(self._crawl(scraper) for scraper in self.scrapers),
+                                           return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for scraper, result in zip(self.scrapers, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Crawl of {scraper.kw} failed: {result}")
+        if errors:
+            raise errors[0]
+        logger.info(f"Batch crawl of {len(self.scrapers)} keywords finished with "
+                    f"{self.resources.influencers.count} influencers.")
+        return {scraper.kw: result for scraper, result in zip(self.scrapers, results)}
@@ -0,0 +1,106 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from components.models import Comment, Reply
+
+logger = logging.getLogger('apify_client')
+
+STRATEGIES = ('newest', 'most_liked', 'author_reply_only')
+
+
+class RequestAllowance:
+    """
+    Reply requests one video may still spend, drawn from the run's budget as well.
+    """
+
+    def __init__(self, budget: 'CommentBudget', limit: Optional[int]):
+        self.budget = budget
+        self.remaining = limit
+
+    def try_spend(self) -> bool:
+        """
+        Spend one request.
+
+        :return: True when both the video and the run budget allow another request
+        """
+        if self.remaining is not None and self.remaining <= 0:
+            return False
+        if not self.budget.spend_run_request():
+            return False
+        if self.remaining is not None:
+            self.remaining -= 1
+        return True
+
+
+@dataclass
+class CommentBudget:
+    """
+    Bounds on the comment and reply traffic of each video and of the whole run.
+
+    Reply threads that need their own requests are expanded in the order of
+    `strategy` until the budget runs out:
+    - `newest`: most recent comments first
+    - `most_liked`: most liked comments first
+    - `author_reply_only`: only threads written or replied to by the video's author
+    """
+    max_comments: int = 100
+    max_comment_pages: int = 5
+    max_replies_per_comment: int = 100
+    reply_requests_per_video: Optional[int] = 50
+    reply_requests_per_run: Optional[int] = None
+    strategy: str = 'most_liked'
+    run_requests: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown comment strategy: {self.strategy}, expected one of {', '.join(STRATEGIES)}")
+
+    @classmethod
+    def from_input(cls, data: Optional[Dict]) -> 'CommentBudget':
+        """
+        Build a budget from the actor input, keeping defaults for missing keys.
+
+        :param data: `comment_budget` input object
+        :return: Comment budget
+        """
+        return cls(**(data or {}))
+
+    def spend_run_request(self) -> bool:
+        if self.reply_requests_per_run is not None and self.run_requests >= self.reply_requests_per_run:
+            return False
+        self.run_requests += 1
+        if self.run_requests == self.reply_requests_per_run:
+            logger.info(f"Reply request budget of {self.reply_requests_per_run} per run exhausted.")
+        return True
+
+    def video_allowance(self) -> RequestAllowance:
+        """
+        :return: Reply request allowance of one video
+        """
+        return RequestAllowance(self, self.reply_requests_per_video)
+
+    def inline_replies(self, comment: Comment) -> List[Reply]:
+        """
+        :param comment: Parent comment
+        :return: The comment's inline reply preview, at most `max_replies_per_comment` replies
+        """
+        return comment.inline_replies[:self.max_replies_per_comment]
+
+    def select_threads(self, comments: List[Comment], unique_id: str) -> List[Comment]:
+        """
+        Order the comments whose reply threads should be expanded.
+
+        :param comments: Parent comments
+        :param unique_id: Video author's unique identifier
+        :return: Comments in expansion order, without the ones the strategy excludes
+        """
+        if self.strategy == 'newest':
+            return sorted(comments, key=lambda c: c.create_time, reverse=True)
+        if self.strategy == 'most_liked':
+            return sorted(comments, key=lambda c: c.digg_count, reverse=True)
+        return [
+            comment for comment in comments
+            if comment.user_unique_id == unique_id
+            or any(reply.user_unique_id == unique_id for reply in comment.inline_replies)
+        ]
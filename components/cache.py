@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from components.constants import data_dir
+from components.sqlite_db import SqliteDatabase
+
+logger = logging.getLogger('apify_client')
+
+HOUR = 60 * 60
+
+# Counters change quickly, identity fields rarely.
+DEFAULT_FIELD_TTLS = {
+    'followerCount': 12 * HOUR,
+    'followingCount': 12 * HOUR,
+    'heart': 12 * HOUR,
+    'heartCount': 12 * HOUR,
+    'videoCount': 12 * HOUR,
+    'diggCount': 12 * HOUR,
+    'friendCount': 12 * HOUR,
+}
+DEFAULT_TTL = 7 * 24 * HOUR
+DEFAULT_CACHE_PATH = os.path.join(data_dir, "author_cache.sqlite")
+
+
+class MemoryLRU:
+    """
+    In-memory least-recently-used map bounded by the serialized size of its values.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key: str, value: Dict, size: int):
+        if key in self._items:
+            self.size -= self._items.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._items[key] = (value, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self.size -= evicted
+
+
+class SqliteTier:
+    """
+    Persistent key/value tier stored in a SQLite file. Calls run in a worker thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = SqliteDatabase(path, self._setup)
+
+    @staticmethod
+    def _setup(conn: sqlite3.Connection):
+        conn.execute("CREATE TABLE IF NOT EXISTS author_cache (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT data FROM author_cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _put(conn: sqlite3.Connection, key: str, data: str):
+        conn.execute("INSERT OR REPLACE INTO author_cache (key, data) VALUES (?, ?)", (key, data))
+        conn.commit()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.db.call(self._get, key)
+
+    async def put(self, key: str, data: str):
+        await self.db.call(self._put, key, data)
+
+    def close(self):
+        self.db.close()
+
+
+class AuthorCache:
+    """
+    Two-tier TTL cache of author metadata: a byte-bounded memory LRU in front of SQLite.
+
+    Every field is stored with its own timestamp and expires after its own TTL,
+    so fast-moving counters can be refreshed more often than identity fields.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = DEFAULT_CACHE_PATH,
+                 memory_bytes: int = 32 * 1024 * 1024,
+                 field_ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = DEFAULT_TTL,
+                 ):
+        """
+        Initialize the cache.
+
+        :param path: SQLite file of the disk tier, None to keep the cache in memory only
+        :param memory_bytes: Byte budget of the memory tier
+        :param field_ttls: TTL in seconds per author field, merged over the defaults
+        :param default_ttl: TTL in seconds of fields without an explicit TTL
+        """
+        self.memory = MemoryLRU(memory_bytes)
+        self.disk = SqliteTier(path) if path else None
+        self.field_ttls = {**DEFAULT_FIELD_TTLS, **(field_ttls or {})}
+        self.default_ttl = default_ttl
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0}
+
+    def _fresh_fields(self, entry: Dict, now: float) -> Dict:
+        return {
+            field: value
+            for field, (value, stored_at) in entry.items()
+            if now - stored_at < self.field_ttls.get(field, self.default_ttl)
+        }
+
+    async def _load(self, key: str) -> Tuple[Optional[Dict], Optional[str]]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry, 'memory_hits'
+        if self.disk is None:
+            return None, None
+        try:
+            data = await self.disk.get(key)
+        except sqlite3.Error as e:
+            logger.error(f"Author cache read failed: {e}")
+            return None, None
+        if data is None:
+            return None, None
+        entry = json.loads(data)
+        self.memory.put(key, entry, len(data))
+        return entry, 'disk_hits'
+
+    async def get(self, unique_id: str, required: Iterable[str] = (),
+                  stale_ok: bool = False) -> Optional[Dict]:
+        """
+        Return the fresh cached fields of an author.
+
+        :param unique_id: Author's unique identifier
+        :param required: Fields that must be cached and fresh for a hit
+        :param stale_ok: Return expired fields as well
+        :return: Fresh fields, or None on a miss
+        """
+        entry, tier = await self._load(unique_id)
+        if entry is not None:
+            if stale_ok:
+                fresh = {field: value for field, (value, _) in entry.items()}
+            else:
+                fresh = self._fresh_fields(entry, time.time())
+            if fresh and all(field in fresh for field in required):
+                self.stats[tier] += 1
+                return fresh
+        self.stats['misses'] += 1
+        return None
+
+    async def put(self, unique_id: str, fields: Dict):
+        """
+        Store author fields, stamping each with the current time.
+
+        :param unique_id: Author's unique identifier
+        :param fields: Author metadata dictionary
+        """
+        if not fields:
+            return
+        now = time.time()
+        entry, _ = await self._load(unique_id)
+        entry = {**(entry or {}), **{field: [value, now] for field, value in fields.items()}}
+        data = json.dumps(entry)
+        self.memory.put(unique_id, entry, len(data))
+        self.stats['writes'] += 1
+        if self.disk is not None:
+            try:
+                await self.disk.put(unique_id, data)
+            except sqlite3.Error as e:
+                logger.error(f"Author cache write failed: {e}")
+
+    def close(self):
+        """
+        Close the disk tier.
+        """
+        if self.disk is not None:
+            self.disk.close()
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+import msgspec
+from apify import Actor, Event
+
+from components.constants import data_dir
+from components.schemas import SearchItem
+
+logger = logging.getLogger('apify_client')
+
+CHECKPOINT_KEY = "CRAWL_CHECKPOINT"
+DEFAULT_CHECKPOINT_PATH = os.path.join(data_dir, "checkpoint.json")
+
+
+class CrawlFrontier:
+    """
+    Resumable crawl state of one keyword.
+
+    - `offset`: next search offset to request; every earlier result is done or pending
+    - `pending`: decoded search items fetched but not finished yet, keyed by video ID
+    - `comment_cursors`: next comment cursor of each pending video
+    - `completed`: influencers already saved
+    """
+
+    def __init__(self, offset: int = 0, pending: Optional[Dict[str, SearchItem]] = None,
+                 comment_cursors: Optional[Dict[str, Any]] = None, completed=()):
+        self.offset = offset
+        self.pending: Dict[str, SearchItem] = pending or {}
+        self.comment_cursors: Dict[str, Any] = comment_cursors or {}
+        self.completed = set(completed)
+
+    def add_pending(self, item: SearchItem):
+        self.pending[item.id] = item
+
+    def finish(self, video_id: str):
+        self.pending.pop(video_id, None)
+        self.comment_cursors.pop(video_id, None)
+
+    def to_dict(self) -> Dict:
+        # Copies, so the checkpoint can be serialized on a worker thread while the crawl goes on.
+        return {
+            'offset': self.offset,
+            'pending': msgspec.to_builtins(self.pending),
+            'comment_cursors': dict(self.comment_cursors),
+            'completed': sorted(self.completed),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'CrawlFrontier':
+        data = data or {}
+        return cls(
+            offset=data.get('offset', 0),
+            pending={video_id: msgspec.convert(item, SearchItem, strict=False)
+                     for video_id, item in (data.get('pending') or {}).items()},
+            comment_cursors=data.get('comment_cursors'),
+            completed=data.get('completed', ()),
+        )
+
+
+class CheckpointManager:
+    """
+    Periodically persists the crawl frontier to the Apify key-value store,
+    falling back to a local JSON file when the store is unavailable.
+    Also persists on the platform's persist-state and migrating events.
+    """
+
+    def __init__(self, key: str = CHECKPOINT_KEY, path: str = DEFAULT_CHECKPOINT_PATH,
+                 interval: float = 60.0):
+        """
+        :param key: Key-value store record key
+        :param path: Local fallback file
+        :param interval: Seconds between periodic checkpoints
+        """
+        self.key = key
+        self.path = path
+        self.interval = interval
+        self._get_state: Optional[Callable[[], Dict]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _read_file(self) -> Optional[Dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def _write_file(self, checkpoint: Optional[Dict]):
+        if checkpoint is None:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.path)
+
+    async def load(self) -> Dict[str, Dict]:
+        """
+        Load the last checkpoint.
+
+        :return: Frontier dictionaries keyed by keyword, empty when there is no checkpoint
+        """
+        checkpoint = None
+        try:
+            checkpoint = await Actor.get_value(self.key)
+        except Exception as e:
+            logger.info(f"Key-value store unavailable, reading local checkpoint: {e}")
+        if checkpoint is None:
+            try:
+                checkpoint = await asyncio.to_thread(self._read_file)
+            except (OSError, ValueError) as e:
+                logger.error(f"Unable to read checkpoint file: {e}")
+        if checkpoint:
+            logger.info(f"Resuming from checkpoint saved at {checkpoint.get('saved_at')}")
+        return (checkpoint or {}).get('keywords', {})
+
+    async def save(self, state: Optional[Dict[str, Dict]] = None):
+        """
+        Persist the frontier.
+
+        :param state: Frontier dictionaries keyed by keyword, taken from the registered source when omitted
+        """
+        if state is None:
+            if self._get_state is None:
+                return
+            state = self._get_state()
+        await self._store({'saved_at': time.time(), 'keywords': state})
+
+    async def clear(self):
+        """
+        Remove the checkpoint after a completed crawl.
+        """
+        await self._store(None)
+
+    async def _store(self, checkpoint: Optional[Dict]):
+        try:
+            await Actor.set_value(self.key, checkpoint)
+            return
+        except Exception as e:
+            logger.info(f"Key-value store unavailable, writing local checkpoint: {e}")
+        try:
+            await asyncio.to_thread(self._write_file, checkpoint)
+        except OSError as e:
+            logger.error(f"Unable to write checkpoint file: {e}")
+
+    async def _on_event(self, *_):
+        await self.save()
+
+    def start(self, get_state: Callable[[], Dict[str, Dict]]):
+        """
+        Start periodic checkpointing.
+
+        :param get_state: Returns the current frontier dictionaries keyed by keyword
+        """
+        self._get_state = get_state
+        self._task = asyncio.create_task(self._run())
+        try:
+            Actor.on(Event.PERSIST_STATE, self._on_event)
+            Actor.on(Event.MIGRATING, self._on_event)
+        except Exception as e:
+            logger.info(f"Actor events unavailable, using periodic checkpoints only: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error(f"Checkpoint failed: {e}")
+
+    async def stop(self, persist: bool = True):
+        """
+        Stop periodic checkpointing.
+
+        :param persist: Write a last checkpoint before stopping
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            Actor.off(Event.PERSIST_STATE, self._on_event)
+            Actor.off(Event.MIGRATING, self._on_event)
+        except Exception:
+            pass
+        if persist:
+            await self.save()
+        self._get_state = None
@@ -0,0 +1,195 @@
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+NO_PARENT = -1
+# `reply_to` of replies whose `reply_to_reply_id` is empty; "0" (a direct reply) is stored as 0.
+NO_REPLY_TO = -1
+
+
+class CommentStore:
+    """
+    Columnar storage of one video's comment tree.
+
+    Every comment and reply is a row of fixed-width `array` columns; texts are
+    UTF-8 slices of one shared buffer addressed by `text_offsets`, and comment
+    authors are interned in a per-video table. Replies point at their parent
+    comment's row through `parent`, top-level comments hold `NO_PARENT`.
+
+    Rows are appended as comment pages and reply threads arrive, so a reply row
+    may follow rows of later comments; `to_records` regroups them. Once appending is done,
+    `columns` and `to_arrow` export the columns without copying them; the store
+    cannot grow while an export is alive.
+    """
+
+    def __init__(self, aweme_id: str = ""):
+        """
+        :param aweme_id: Video the comments belong to
+        """
+        self.aweme_id = aweme_id
+        self.cid = array('Q')
+        self.parent = array('q')
+        self.author = array('I')
+        self.create_time = array('q')
+        self.digg_count = array('q')
+        self.reply_total = array('q')
+        self.reply_to = array('q')
+        self.is_author_reply = array('b')
+        self.text_offsets = array('q', [0])
+        self.text = bytearray()
+        self.authors: List[Tuple[str, str]] = []
+        self._author_index: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def from_comments(cls, comments: Iterable, aweme_id: str = "") -> 'CommentStore':
+        """
+        Build a store from resolved comments.
+
+        :param comments: `models.Comment` objects
+        :param aweme_id: Video the comments belong to
+        :return: Comment store
+        """
+        store = cls(aweme_id)
+        for comment in comments:
+            store.append_comment(comment)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.cid)
+
+    def _intern_author(self, unique_id: str, nickname: str) -> int:
+        key = (unique_id, nickname)
+        index = self._author_index.get(key)
+        if index is None:
+            index = self._author_index[key] = len(self.authors)
+            self.authors.append(key)
+        return index
+
+    def _append_row(self, row, parent: int, reply_total: int, reply_to: str) -> int:
+        index = len(self.cid)
+        self.cid.append(int(row.cid))
+        self.parent.append(parent)
+        self.author.append(self._intern_author(row.user_unique_id, row.user_nickname))
+        self.create_time.append(row.create_time)
+        self.digg_count.append(row.digg_count)
+        self.reply_total.append(reply_total)
+        self.reply_to.append(int(reply_to) if reply_to else NO_REPLY_TO)
+        self.is_author_reply.append(row.is_author_reply)
+        self.text += row.text.encode()
+        self.text_offsets.append(len(self.text))
+        return index
+
+    def append_comment(self, comment) -> int:
+        """
+        Append a top-level comment, followed by its replies when its thread is resolved.
+        The replies of an unresolved thread are appended later with `append_replies`.
+
+        :param comment: `models.Comment`
+        :return: Row of the comment
+        """
+        index = self._append_row(comment, NO_PARENT, comment.reply_total, "")
+        if comment.replies is not None:
+            self.append_replies(index, comment.replies)
+        return index
+
+    def append_replies(self, parent: int, replies: Iterable):
+        """
+        Append the replies of the comment stored at row `parent`.
+
+        :param parent: Row of the parent comment
+        :param replies: `models.Reply` objects
+        """
+        for reply in replies:
+            self.append_reply(parent, reply)
+
+    def append_reply(self, parent: int, reply) -> int:
+        """
+        Append a reply to the comment stored at row `parent`.
+
+        :param parent: Row of the parent comment
+        :param reply: `models.Reply`
+        :return: Row of the reply
+        """
+        return self._append_row(reply, parent, 0, reply.reply_to_reply_id)
+
+    def text_at(self, row: int) -> str:
+        """
+        :param row: Row index
+        :return: Text of the row
+        """
+        return self.text[self.text_offsets[row]:self.text_offsets[row + 1]].decode()
+
+    def _row_dict(self, row: int) -> Dict:
+        unique_id, nickname = self.authors[self.author[row]]
+        return {
+            'cid': str(self.cid[row]),
+            'text': self.text_at(row),
+            'create_time': self.create_time[row],
+            'digg_count': self.digg_count[row],
+            'user': {'unique_id': unique_id, 'nickname': nickname},
+            'is_author_reply': bool(self.is_author_reply[row]),
+        }
+
+    def to_records(self) -> List[Dict]:
+        """
+        Rebuild the nested comment layout of `models.Comment.to_dict`, with every stored reply under `replies`.
+
+        :return: Comment dictionaries
+        """
+        records = []
+        by_row = {}
+        for row in range(len(self)):
+            data = self._row_dict(row)
+            parent = self.parent[row]
+            if parent == NO_PARENT:
+                data.update({
+                    'aweme_id': self.aweme_id,
+                    'reply_comment_total': self.reply_total[row],
+                    'reply_comment': [],
+                    'replies': [],
+                })
+                by_row[row] = data
+                records.append(data)
+            else:
+                reply_to = self.reply_to[row]
+                data['reply_to_reply_id'] = "" if reply_to == NO_REPLY_TO else str(reply_to)
+                by_row[parent]['replies'].append(data)
+        return records
+
+    def columns(self) -> Dict[str, memoryview]:
+        """
+        Export every column as a memoryview over the store's own buffers.
+
+        :return: Column name to memoryview, `text` being the UTF-8 buffer sliced by `text_offsets`
+        """
+        names = ('cid', 'parent', 'author', 'create_time', 'digg_count', 'reply_total',
+                 'reply_to', 'is_author_reply', 'text_offsets', 'text')
+        return {name: memoryview(getattr(self, name)) for name in names}
+
+    def to_arrow(self):
+        """
+        Export the store as an Arrow table sharing the store's buffers.
+        Requires the optional `pyarrow` package.
+
+        :return: `pyarrow.Table` with one row per comment or reply
+        """
+        import pyarrow as pa
+
+        rows = len(self)
+
+        def column(values: array, arrow_type):
+            return pa.Array.from_buffers(arrow_type, rows, [None, pa.py_buffer(values)])
+
+        text = pa.Array.from_buffers(pa.large_string(), rows,
+                                     [None, pa.py_buffer(self.text_offsets), pa.py_buffer(self.text)])
+        unique_ids = pa.array([unique_id for unique_id, _ in self.authors], pa.string())
+        return pa.table({
+            'cid': column(self.cid, pa.uint64()),
+            'parent': column(self.parent, pa.int64()),
+            'author': pa.DictionaryArray.from_arrays(column(self.author, pa.uint32()), unique_ids),
+            'create_time': column(self.create_time, pa.int64()),
+            'digg_count': column(self.digg_count, pa.int64()),
+            'reply_total': column(self.reply_total, pa.int64()),
+            'reply_to': column(self.reply_to, pa.int64()),
+            'is_author_reply': column(self.is_author_reply, pa.int8()),
+            'text': text,
+        })
@@ -236,3 +236,5 @@ params_reply = {
 
 data_dir = "./Data"
 
+INFLUENCERS_API_URL = "https://dev.quokkaai.org/api/v1/influencers/"
+
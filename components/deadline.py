@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger('apify_client')
+
+# Fraction of the crawl time after which each kind of optional work is shed.
+DEFAULT_SHED_AT = {'replies': 0.7, 'comments': 0.85, 'profile': 0.95}
+
+
+class RunDeadline:
+    """
+    Tracks a run's time limit and sheds optional work as it approaches.
+
+    The crawl time is the run deadline minus `drain_reserve`, which is kept free
+    to flush the sinks. Reply threads are shed first, then comments, then profile
+    refreshes; `expired` is set once the crawl time is used up.
+    """
+
+    def __init__(self, seconds: float, drain_reserve: float = 60.0,
+                 shed_at: Optional[Dict[str, float]] = None):
+        """
+        :param seconds: Run time limit
+        :param drain_reserve: Seconds reserved at the end of the run to drain the sinks
+        :param shed_at: Fraction of the crawl time after which replies, comments and profile refreshes are shed
+        """
+        self.seconds = seconds
+        self.drain_reserve = min(drain_reserve, seconds / 2)
+        self.shed_at = {**DEFAULT_SHED_AT, **(shed_at or {})}
+        self.expired = asyncio.Event()
+        self._started: Optional[float] = None
+        self._shed = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def crawl_seconds(self) -> float:
+        """Time available for crawling before the drain reserve."""
+        return self.seconds - self.drain_reserve
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started if self._started is not None else 0.0
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left before the run time limit, drain reserve included."""
+        return max(0.0, self.seconds - self.elapsed)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the crawl time used."""
+        return self.elapsed / self.crawl_seconds if self.crawl_seconds > 0 else 1.0
+
+    def start(self):
+        """
+        Start the clock and the expiry timer.
+        """
+        self._started = time.monotonic()
+        self._task = asyncio.create_task(self._expire())
+
+    async def _expire(self):
+        await asyncio.sleep(max(0.0, self.crawl_seconds - self.elapsed))
+        logger.info(f"Run deadline reached after {self.elapsed:.0f}s, "
+                    f"keeping {self.drain_reserve:.0f}s to drain the sinks.")
+        self.expired.set()
+
+    def allows(self, work: str) -> bool:
+        """
+        Whether optional work may still be started.
+
+        :param work: `replies`, `comments` or `profile`
+        :return: False once the work's shedding point has passed
+        """
+        if self._started is None:
+            return True
+        if self.expired.is_set() or self.progress >= self.shed_at[work]:
+            if work not in self._shed:
+                self._shed.add(work)
+                logger.info(f"Shedding {work} at {self.progress:.0%} of the run deadline.")
+            return False
+        return True
+
+    async def stop(self):
+        """
+        Cancel the expiry timer.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
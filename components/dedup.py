@@ -0,0 +1,91 @@
+import asyncio
+from typing import Iterable, Set
+
+
+class InfluencerIndex:
+    """
+    Tracks which influencers have been claimed and completed during a crawl.
+
+    Each author is claimed by the first video that surfaces them; later videos of
+    the same author are skipped. `limit_reached` is set once `max_influencers`
+    distinct authors have been completed, so the crawl can stop immediately.
+    """
+
+    def __init__(self, max_influencers: int):
+        """
+        :param max_influencers: Number of distinct influencers after which the crawl stops
+        """
+        self.max_influencers = max_influencers
+        self.limit_reached = asyncio.Event()
+        self._claimed: Set[str] = set()
+        self._completed: Set[str] = set()
+        self._reserved = 0
+
+    @property
+    def count(self) -> int:
+        """Number of distinct influencers completed."""
+        return len(self._completed)
+
+    def seen(self, unique_id: str) -> bool:
+        return unique_id in self._claimed
+
+    def restore(self, completed: Iterable[str]):
+        """
+        Seed the index with influencers completed by an interrupted run.
+
+        :param completed: Unique identifiers of the completed influencers
+        """
+        self._completed.update(completed)
+        self._claimed.update(self._completed)
+        if len(self._completed) >= self.max_influencers:
+            self.limit_reached.set()
+
+    def claim(self, unique_id: str) -> bool:
+        """
+        Claim an influencer for processing.
+
+        :param unique_id: Author's unique identifier
+        :return: True when the caller should process the author, False if it is already claimed or the limit is reached
+        """
+        if self.limit_reached.is_set() or unique_id in self._claimed:
+            return False
+        self._claimed.add(unique_id)
+        return True
+
+    def release(self, unique_id: str, reserved: bool = False):
+        """
+        Give up a claim after a failure so another video of the author can be processed.
+
+        :param unique_id: Author's unique identifier
+        :param reserved: Whether the caller also holds a completion reservation
+        """
+        if reserved:
+            self._reserved -= 1
+        if unique_id not in self._completed:
+            self._claimed.discard(unique_id)
+
+    def reserve(self) -> bool:
+        """
+        Reserve one of the remaining completion slots before saving a record,
+        so concurrent saves can never exceed `max_influencers`.
+
+        :return: True when a slot was reserved
+        """
+        if self.limit_reached.is_set() or len(self._completed) + self._reserved >= self.max_influencers:
+            return False
+        self._reserved += 1
+        return True
+
+    def complete(self, unique_id: str) -> bool:
+        """
+        Mark a reserved influencer as processed.
+
+        :param unique_id: Author's unique identifier
+        :return: True when this completion reached the limit
+        """
+        self._reserved -= 1
+        self._completed.add(unique_id)
+        if len(self._completed) >= self.max_influencers:
+            self.limit_reached.set()
+            return True
+        return False
@@ -0,0 +1,148 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from components.schemas import SearchItem
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+SECONDS_PER_DAY = 86400
+# 1970-01-01 was a Thursday.
+EPOCH_WEEKDAY = 3
+
+
+@dataclass(slots=True)
+class AuthorEngagement:
+    """
+    Engagement statistics of one author over every video seen during the run.
+    Weekdays and posting times are in UTC; engagement rates are percentages.
+    """
+    video_count: int
+    mean_engagement: float
+    engagement_by_day: Dict[str, float] = field(default_factory=dict)
+    avg_posting_time: str = ""
+
+
+class EngagementIndex:
+    """
+    Collects the stats and timestamps of every video seen for each author and
+    computes per-author engagement statistics for many authors at once.
+
+    Videos are appended to run-wide columns tagged with an author code, so one
+    `compute` call aggregates any number of authors with grouped NumPy
+    reductions instead of a Python loop per author.
+    """
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self._video_ids = set()
+        self.author = array('I')
+        self.create_time = array('q')
+        self.likes = array('q')
+        self.comments = array('q')
+        self.shares = array('q')
+        self.views = array('q')
+
+    def __len__(self) -> int:
+        return len(self.author)
+
+    def add(self, unique_id: str, video_id: str, create_time: int,
+            likes: int, comments: int, shares: int, views: int) -> bool:
+        """
+        Record a video of an author. Videos already recorded are ignored.
+
+        :param unique_id: Author's unique identifier
+        :param video_id: Unique video identifier
+        :param create_time: Video creation timestamp
+        :param likes: Number of likes
+        :param comments: Number of comments
+        :param shares: Number of shares
+        :param views: Number of views
+        :return: True when the video was new
+        """
+        if video_id in self._video_ids:
+            return False
+        self._video_ids.add(video_id)
+        code = self._codes.setdefault(unique_id, len(self._codes))
+        self.author.append(code)
+        self.create_time.append(create_time)
+        self.likes.append(likes)
+        self.comments.append(comments)
+        self.shares.append(shares)
+        self.views.append(views)
+        return True
+
+    def add_search_item(self, item: SearchItem) -> bool:
+        """
+        Record the video of a search result item.
+
+        :param item: Decoded search item
+        :return: True when the video was new
+        """
+        return self.add(
+            unique_id=item.author.uniqueId,
+            video_id=item.id,
+            create_time=item.createTime,
+            likes=item.stats.diggCount,
+            comments=item.stats.commentCount,
+            shares=item.stats.shareCount,
+            views=item.stats.playCount,
+        )
+
+    def compute(self, unique_ids: Optional[Iterable[str]] = None) -> Dict[str, AuthorEngagement]:
+        """
+        Compute the engagement statistics of several authors in one pass.
+
+        :param unique_ids: Authors to compute, every recorded author when omitted
+        :return: Statistics per author with at least one recorded video
+        """
+        if unique_ids is None:
+            names = list(self._codes)
+        else:
+            names = [unique_id for unique_id in dict.fromkeys(unique_ids) if unique_id in self._codes]
+        if not names:
+            return {}
+
+        # Map the requested authors to dense group numbers and keep only their videos.
+        group_of = np.full(len(self._codes), -1, dtype=np.int64)
+        group_of[[self._codes[name] for name in names]] = np.arange(len(names))
+        groups = group_of[np.array(self.author, dtype=np.int64)]
+        mask = groups >= 0
+        groups = groups[mask]
+        n = len(names)
+
+        create_time = np.array(self.create_time, dtype=np.int64)[mask]
+        views = np.array(self.views, dtype=np.float64)[mask]
+        interactions = (np.array(self.likes, dtype=np.float64)[mask]
+                        + np.array(self.comments, dtype=np.float64)[mask]
+                        + np.array(self.shares, dtype=np.float64)[mask])
+        rate = np.divide(interactions * 100, views, out=np.zeros_like(views), where=views > 0)
+
+        counts = np.bincount(groups, minlength=n)
+        mean = np.bincount(groups, weights=rate, minlength=n) / counts
+
+        # Mean rate per UTC weekday.
+        weekday = (create_time // SECONDS_PER_DAY + EPOCH_WEEKDAY) % 7
+        day_keys = groups * 7 + weekday
+        day_counts = np.bincount(day_keys, minlength=n * 7).reshape(n, 7)
+        day_sums = np.bincount(day_keys, weights=rate, minlength=n * 7).reshape(n, 7)
+        by_day = np.divide(day_sums, day_counts, out=np.zeros((n, 7)), where=day_counts > 0)
+
+        # Circular mean of the posting time, so 23:00 and 01:00 average to midnight.
+        seconds = create_time % SECONDS_PER_DAY
+        angle = seconds * (2 * np.pi / SECONDS_PER_DAY)
+        mean_angle = np.arctan2(np.bincount(groups, weights=np.sin(angle), minlength=n),
+                                np.bincount(groups, weights=np.cos(angle), minlength=n))
+        minutes = np.rint((mean_angle % (2 * np.pi)) * (1440 / (2 * np.pi))).astype(np.int64) % 1440
+
+        return {
+            name: AuthorEngagement(
+                video_count=int(counts[i]),
+                mean_engagement=float(mean[i]),
+                engagement_by_day={WEEKDAYS[d]: round(float(by_day[i, d]), 4)
+                                   for d in range(7) if day_counts[i, d]},
+                avg_posting_time=f"{minutes[i] // 60:02d}:{minutes[i] % 60:02d}",
+            )
+            for i, name in enumerate(names)
+        }
@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+# Share of max_workers given to each traffic class when no explicit limit is set.
+DEFAULT_SHARES = {
+    'search': 0.2,
+    'profile': 1.0,
+    'comment': 0.5,
+    'reply': 0.5,
+    'sink': 0.5,
+}
+
+
+class ConcurrencyGovernor:
+    """
+    Per-endpoint concurrency limits for every network call.
+
+    Each traffic class (search, profile, comment, reply, sink) has its own
+    semaphore, so one class can never starve the others or burst past its limit.
+    """
+
+    def __init__(self, max_workers: int = 10, limits: Optional[Dict[str, int]] = None):
+        """
+        Initialize the governor.
+
+        :param max_workers: Base worker count the default limits are derived from
+        :param limits: Explicit per-endpoint limits overriding the defaults
+        """
+        limits = limits or {}
+        unknown = set(limits) - set(DEFAULT_SHARES)
+        if unknown:
+            raise ValueError(f"Unknown concurrency endpoints: {sorted(unknown)}")
+
+        self.limits = {
+            endpoint: max(1, int(limits.get(endpoint) or round(max_workers * share)))
+            for endpoint, share in DEFAULT_SHARES.items()
+        }
+        self._slots = {endpoint: asyncio.Semaphore(limit) for endpoint, limit in self.limits.items()}
+        self.in_flight = dict.fromkeys(self.limits, 0)
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str):
+        """
+        Hold one concurrency slot of the given endpoint for the duration of the block.
+
+        :param endpoint: Traffic class name
+        """
+        async with self._slots[endpoint]:
+            self.in_flight[endpoint] += 1
+            try:
+                yield
+            finally:
+                self.in_flight[endpoint] -= 1
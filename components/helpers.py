@@ -15,23 +15,13 @@ logging.basicConfig(
 logger = logging.getLogger('apify_client')
 
 
-async def get_request_data_async(url, **kwargs):
-    headers = kwargs.get('headers', {})
-    params = kwargs.get('params', {})
-    cookies = kwargs.get('cookies', {})
+class FetchError(Exception):
+    """Raised when a request fails or returns an unexpected status."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
-    async with httpx.AsyncClient(headers=headers, cookies=cookies) as client:
-        try:
-            response = await client.get(url, params=params)
-            if response.status_code == 200:
-                logger.info(f"Returning data for url: {url}")
-                return response.text
-            else:
-                logger.info(f"Unable to get data for url. Status {response.status_code}")
-                return None
-        except httpx.HTTPError as e:
-            logger.info(f"Unable to get data for url. Error {e}")
-            return None
 
 def get_request_data_sync(url, **kwargs):
     headers = kwargs.get('headers', {})
@@ -51,25 +41,20 @@ def get_request_data_sync(url, **kwargs):
         logger.info(f"Unable to get data for url. Error {e}")
         return None
 
-def input_data_to_api(url, **kwargs):
-    headers = kwargs.get('headers', {})
+async def input_data_to_api_async(url, **kwargs):
+    client = kwargs['client']
     params = kwargs.get('params', {})
-    cookies = kwargs.get('cookies', {})
     json_data = kwargs.get('json', {})
 
     try:
-        response = requests.post(url, headers=headers, params=params, cookies=cookies,
-                                json=json_data)
+        response = await client.post(url, params=params, json=json_data)
         if response.status_code == 200:
-            data = response.text
             logger.info(f"Returning data for url: {url}")
-            return data
-        elif response.status_code == 422:
-            i = 0
+            return response.text
         else:
             logger.info(f"Unable to get data for url. Status {response.status_code}")
             return None
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.info(f"Unable to get data for url. Error {e}")
         return None
 
@@ -91,3 +76,44 @@ def extract_json_data(response_text: str, sub: str) -> Optional[dict]:
         return None
     return data
 
+
+class ScriptBlockScanner:
+    """
+    Incrementally locate the body of a `<script id="...">` block in a byte stream.
+
+    Feed response chunks as they arrive; `feed` returns the raw bytes between the
+    opening tag and `</script>` once the closing tag has been seen, so the caller
+    can stop reading. Only byte searches are used, the page is never parsed.
+    """
+    END = b'</script>'
+
+    def __init__(self, script_id: str):
+        self.marker = f'id="{script_id}"'.encode()
+        self.buffer = bytearray()
+        self.bytes_read = 0
+        self._start = -1
+        self._pos = 0
+
+    def feed(self, chunk: bytes) -> Optional[bytes]:
+        self.bytes_read += len(chunk)
+        self.buffer += chunk
+        if self._start < 0:
+            found = self.buffer.find(self.marker)
+            if found < 0:
+                # Only a marker split across chunks can still match; drop the rest.
+                keep = len(self.marker) - 1
+                if len(self.buffer) > keep:
+                    del self.buffer[:len(self.buffer) - keep]
+                return None
+            del self.buffer[:found]
+            tag_end = self.buffer.find(b'>', len(self.marker))
+            if tag_end < 0:
+                return None
+            self._start = self._pos = tag_end + 1
+
+        end = self.buffer.find(self.END, self._pos)
+        if end < 0:
+            # Resume the search where a closing tag split across chunks could begin.
+            self._pos = max(self._start, len(self.buffer) - len(self.END) + 1)
+            return None
+        return bytes(self.buffer[self._start:end])
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger('apify_client')
+
+WARMUP_URLS = ("https://www.tiktok.com/",)
+
+
+class HttpClientManager:
+    """
+    Long-lived pooled HTTP client shared by every TikTok fetch.
+
+    Features:
+    - Keep-alive connection reuse across requests
+    - HTTP/2 multiplexing
+    - Per-host connection limits
+    - Pre-warming of the pool at startup and clean shutdown
+    """
+
+    def __init__(self,
+                 headers: Optional[Dict] = None,
+                 cookies: Optional[Dict] = None,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0,
+                 per_host_limit: int = 10,
+                 http2: bool = True,
+                 timeout: float = 20.0,
+                 warmup_urls=WARMUP_URLS,
+                 ):
+        """
+        Initialize the client manager. The underlying client is created on `start()`.
+
+        :param headers: Default headers sent with every request
+        :param cookies: Default cookies sent with every request
+        :param max_connections: Maximum number of open connections in the pool
+        :param max_keepalive_connections: Maximum number of idle connections kept alive
+        :param keepalive_expiry: Seconds an idle connection is kept before closing
+        :param per_host_limit: Maximum number of concurrent requests per host
+        :param http2: Enable HTTP/2 negotiation
+        :param timeout: Request timeout in seconds
+        :param warmup_urls: URLs requested on startup to open connections ahead of time
+        """
+        self.headers = headers or {}
+        self.cookies = cookies or {}
+        self.per_host_limit = per_host_limit
+        self.http2 = http2
+        self.warmup_urls = warmup_urls
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("HttpClientManager is not started.")
+        return self._client
+
+    async def start(self):
+        """
+        Create the pooled client and pre-warm connections to the known hosts.
+        """
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            cookies=self.cookies,
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=self.http2,
+            follow_redirects=True,
+        )
+        await self.warmup()
+
+    async def warmup(self):
+        """
+        Open connections to the warmup URLs so the first real requests skip the handshake.
+        """
+        async def _touch(url):
+            try:
+                await self.client.head(url)
+            except httpx.HTTPError as e:
+                logger.info(f"Warmup request failed for url: {url}. Error {e}")
+
+        await asyncio.gather(*(_touch(url) for url in self.warmup_urls))
+
+    async def close(self):
+        """
+        Close all pooled connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_slots[host]
+
+    async def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> httpx.Response:
+        """
+        Send a GET request through the shared pool.
+
+        :param url: Request URL
+        :param params: Query parameters
+        :return: Response object
+        """
+        async with self._host_slot(url):
+            return await self.client.get(url, params=params, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, url: str, params: Optional[Dict] = None, **kwargs):
+        """
+        Open a streaming GET request through the shared pool.
+        Leaving the block before the body is consumed closes the response early.
+
+        :param url: Request URL
+        :param params: Query parameters
+        :return: Response object with an unread body
+        """
+        async with self._host_slot(url):
+            async with self.client.stream('GET', url, params=params, **kwargs) as response:
+                yield response
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a POST request through the shared pool.
+
+        :param url: Request URL
+        :return: Response object
+        """
+        async with self._host_slot(url):
+            return await self.client.post(url, **kwargs)
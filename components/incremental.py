@@ -0,0 +1,107 @@
+import logging
+import os
+import sqlite3
+from typing import List, Set, Tuple
+
+from components.constants import data_dir
+from components.sqlite_db import SqliteDatabase
+
+logger = logging.getLogger('apify_client')
+
+DEFAULT_SEEN_PATH = os.path.join(data_dir, "seen_videos.sqlite")
+# Seen IDs older than this many seconds before the watermark are pruned.
+DEFAULT_RETENTION = 90 * 24 * 60 * 60
+
+
+class SeenVideoStore:
+    """
+    Persisted per-keyword record of processed video IDs and their `createTime` watermark.
+
+    Used by incremental crawls to skip videos handled in earlier cycles before
+    any profile or comment work is done.
+    """
+
+    def __init__(self, path: str = DEFAULT_SEEN_PATH, retention: float = DEFAULT_RETENTION,
+                 flush_every: int = 50):
+        """
+        :param path: SQLite file
+        :param retention: Seconds before the watermark after which seen IDs are pruned
+        :param flush_every: Number of marked videos buffered before they are written
+        """
+        self.path = path
+        self.retention = retention
+        self.flush_every = flush_every
+        self.db = SqliteDatabase(path, self._setup)
+        self._pending: List[Tuple[str, str, int]] = []
+
+    @staticmethod
+    def _setup(conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_videos ("
+            "keyword TEXT NOT NULL, video_id TEXT NOT NULL, create_time INTEGER NOT NULL, "
+            "PRIMARY KEY (keyword, video_id))"
+        )
+
+    @staticmethod
+    def _load(conn: sqlite3.Connection, keyword: str) -> Tuple[Set[str], int]:
+        rows = conn.execute(
+            "SELECT video_id, create_time FROM seen_videos WHERE keyword = ?", (keyword,)
+        ).fetchall()
+        watermark = max((row[1] for row in rows), default=0)
+        return {row[0] for row in rows}, watermark
+
+    def _write(self, conn: sqlite3.Connection, rows: List[Tuple[str, str, int]]):
+        conn.executemany(
+            "INSERT OR REPLACE INTO seen_videos (keyword, video_id, create_time) VALUES (?, ?, ?)", rows
+        )
+        for keyword in {row[0] for row in rows}:
+            conn.execute(
+                "DELETE FROM seen_videos WHERE keyword = ? AND create_time < "
+                "(SELECT MAX(create_time) FROM seen_videos WHERE keyword = ?) - ?",
+                (keyword, keyword, self.retention)
+            )
+        conn.commit()
+
+    async def load(self, keyword: str) -> Tuple[Set[str], int]:
+        """
+        Load the seen video IDs and the newest seen `createTime` of a keyword.
+
+        :param keyword: Search keyword
+        :return: Seen IDs and watermark
+        """
+        try:
+            return await self.db.call(self._load, keyword)
+        except sqlite3.Error as e:
+            logger.error(f"Unable to load seen videos for {keyword}: {e}")
+            return set(), 0
+
+    async def mark(self, keyword: str, video_id: str, create_time: int):
+        """
+        Record a processed video, writing in batches of `flush_every`.
+
+        :param keyword: Search keyword
+        :param video_id: Video ID
+        :param create_time: Video creation timestamp
+        """
+        self._pending.append((keyword, str(video_id), int(create_time or 0)))
+        if len(self._pending) >= self.flush_every:
+            await self.flush()
+
+    async def flush(self):
+        """
+        Write the buffered videos.
+        """
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        try:
+            await self.db.call(self._write, rows)
+        except sqlite3.Error as e:
+            logger.error(f"Unable to save seen videos: {e}")
+
+    async def close(self):
+        """
+        Flush and close the store.
+        """
+        await self.flush()
+        self.db.close()
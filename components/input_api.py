@@ -1,19 +1,34 @@
+import json
 from datetime import datetime
+from typing import Optional
 
-def fill_profile_data(data):
-    author_data = data.get('author', {})
+from components.engagement import AuthorEngagement
+from components.models import Video
+
+# Record fields read by fill_profile_data, used to plan which crawl stages are needed.
+PROFILE_FIELDS = frozenset({
+    'author.nickname',
+    'author.unique_id',
+    'author.signature',
+    'author.follower_count',
+    'create_time',
+    'engagement_rate',
+})
+
+def fill_profile_data(video: Video, engagement: Optional[AuthorEngagement] = None):
+    author = video.author
     _form = {
-        "name": author_data.get('nickname', ""),
-        "username":  author_data.get('uniqueId', ""),
-        "email": f"{author_data.get('uniqueId', '')}@gmail.com",
-        "bio": author_data.get("signature", ""),
-        "profile_url": f"https://www.tiktok.com/{author_data.get('uniqueId', '')}",
+        "name": author.nickname,
+        "username":  author.unique_id,
+        "email": f"{author.unique_id}@gmail.com",
+        "bio": author.signature,
+        "profile_url": f"https://www.tiktok.com/{author.unique_id}",
         "avatar_url": "",
         "location": "",
-        "date_last_post": datetime.fromtimestamp(data['create_time']).strftime("%Y-%m-%d %H:%M:%S"),
+        "date_last_post": datetime.fromtimestamp(video.create_time).strftime("%Y-%m-%d %H:%M:%S"),
         "fake_follower_rate": 0,
-        "avg_engagement_by_day": "",
-        "avg_posting_time": "",
+        "avg_engagement_by_day": json.dumps(engagement.engagement_by_day) if engagement else "",
+        "avg_posting_time": engagement.avg_posting_time if engagement else "",
         "platform_ids": [
             "fa6b5bf2-5154-487a-9482-168fdacef1ae"
         ],
@@ -21,8 +36,8 @@ def fill_profile_data(data):
             "9e7d2d14-6fbd-4930-ad69-72c851967f78"
         ],
         "metrics": {
-            "follower_count": author_data.get('followerCount', ""),
-            "engagement_rate": data.get('engagement_rate', ""),
+            "follower_count": author.follower_count,
+            "engagement_rate": engagement.mean_engagement if engagement else video.engagement_rate,
             "active_status": True
         },
         "platform_metrics": [
@@ -1,44 +1,349 @@
-import requests
-
-cookies = {
-    'datr': 'gVyTZ-VCn8GiWn_0ep7Iz_il',
-    'sb': 'gVyTZ0MeyGbB88L9JU5SJdO7',
-    'ps_l': '1',
-    'ps_n': '1',
-    'c_user': '100081552710469',
-    'cppo': '1',
-    'ar_debug': '1',
-    'fr': '1gVBLAtTnSwW4MASa.AWUregh61P403Bfn6vi2qMmYGfUVIV8z3MOH5A.BnrXjR..AAA.0.0.BnrXjR.AWUQODdrawU',
-    'xs': '19%3AYFva1u9-3p6Vow%3A2%3A1739274928%3A-1%3A6804%3A%3AAcXRpy-H5eB0DHrXTxH09TvAe9WsKPnsJyYuF8hpgw',
-    'presence': 'C%7B%22t3%22%3A%5B%5D%2C%22utc3%22%3A1739422117762%2C%22v%22%3A1%7D',
-    'wd': '515x723',
-}
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from components.comment_store import CommentStore
+from components.schemas import CommentItem, ReplyItem, SearchItem
 
-headers = {
-    'accept': '*/*',
-    'accept-language': 'en-US,en;q=0.9',
-    'content-type': 'application/x-www-form-urlencoded',
-    # 'cookie': 'datr=gVyTZ-VCn8GiWn_0ep7Iz_il; sb=gVyTZ0MeyGbB88L9JU5SJdO7; ps_l=1; ps_n=1; c_user=100081552710469; cppo=1; ar_debug=1; fr=1gVBLAtTnSwW4MASa.AWUregh61P403Bfn6vi2qMmYGfUVIV8z3MOH5A.BnrXjR..AAA.0.0.BnrXjR.AWUQODdrawU; xs=19%3AYFva1u9-3p6Vow%3A2%3A1739274928%3A-1%3A6804%3A%3AAcXRpy-H5eB0DHrXTxH09TvAe9WsKPnsJyYuF8hpgw; presence=C%7B%22t3%22%3A%5B%5D%2C%22utc3%22%3A1739422117762%2C%22v%22%3A1%7D; wd=515x723',
-    'origin': 'https://accountscenter.facebook.com',
-    'priority': 'u=1, i',
-    'referer': 'https://accountscenter.facebook.com/personal_info/contact_points/?contact_point_type=phone_number&contact_point_value=%2B84338668340&dialog_type=contact_detail',
-    'sec-ch-prefers-color-scheme': 'dark',
-    'sec-ch-ua': '"Not A(Brand";v="8", "Chromium";v="132", "Google Chrome";v="132"',
-    'sec-ch-ua-full-version-list': '"Not A(Brand";v="8.0.0.0", "Chromium";v="132.0.6834.162", "Google Chrome";v="132.0.6834.162"',
-    'sec-ch-ua-mobile': '?0',
-    'sec-ch-ua-model': '""',
-    'sec-ch-ua-platform': '"macOS"',
-    'sec-ch-ua-platform-version': '"13.4.0"',
-    'sec-fetch-dest': 'empty',
-    'sec-fetch-mode': 'cors',
-    'sec-fetch-site': 'same-origin',
-    'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
-    'x-asbd-id': '129477',
-    'x-fb-friendly-name': 'useTwoStepVerificationSendCodeMutation',
-    'x-fb-lsd': 'MhONw2OWOFlyOlAFEbfq4A',
+# TikTok's camelCase author keys and the Author attributes they map to.
+AUTHOR_KEYS = {
+    'uniqueId': 'unique_id',
+    'id': 'id',
+    'nickname': 'nickname',
+    'signature': 'signature',
+    'secUid': 'sec_uid',
+    'verified': 'verified',
+    'followerCount': 'follower_count',
+    'followingCount': 'following_count',
+    'heart': 'heart_count',
+    'heartCount': 'heart_count',
+    'videoCount': 'video_count',
+    'diggCount': 'digg_count',
+    'friendCount': 'friend_count',
 }
 
-data = 'av=100081552710469&__user=100081552710469&__a=1&__req=i&__hs=20132.HYP%3Aaccounts_center_pkg.2.1...0&dpr=2&__ccg=EXCELLENT&__rev=1020065976&__s=dzzhx6%3Aic0eqv%3A0qioq4&__hsi=7470761322334491342&__dyn=7xeUmwlEnwn8K2Wmh0no6u5U4e0yoW3q32360CEbotw47wUx609vCwjE0AC0yE6ucw5Mx61vw9m1YwBgao6C0Mo2swlo5qfK0EUjwGzE2ZwNwmE2eU5O0HUvw6iyES1Tw8W0Lo6-3u362-0VE6O1FwlU6S0IUuwm85K0UE&__csr=gp8-HkjmWSDnncJkmRAZtUHIBfiFljFSGFGCRFz-YLtZf988UAxfHGmfjGV4XyUIjFUAwUxFoTAQ8qiJqFamfAWVkUmxZaUGHjWF2oyudDHwBWxm4EhgTyVK-8x2Vaz9-4Am9xapbK444-4lUpw04Gcw264ih9BWy8KAHWK2vVaGaAwfOU56U7QheE8A2kje585C3x09i0f6BWxNe8yeA1uHhH859paw1vt5Dyp60VGGmJ4WwEQmi5uGXBqFAw9JHwlE-ewXgqG78giho62qq5FFU1Je0tJ5CJyAE8A2lcAM3pG9GVYEhybwzwj8W8CUj4Pwuoc48G9K6E8FqBGbKE&__comet_req=5&fb_dtsg=NAcME61dlxrIKPFFh7i6xKYYuIbo1eY6JYvVG_VCIOh3LqKmZekJELA%3A19%3A1739274928&jazoest=25386&lsd=MhONw2OWOFlyOlAFEbfq4A&__spin_r=1020065976&__spin_b=trunk&__spin_t=1739422167&fb_api_caller_class=RelayModern&fb_api_req_friendly_name=useTwoStepVerificationSendCodeMutation&variables=%7B%22encryptedContext%22%3A%22AWPOCkFFXHmXvsl6pQOlTJngc6ry2mgy2gFJHxlZBF7R4qhMkBvRNbmrhXk_O9ycncVZxPhJjH4WoZoH1ENJOC2r4XEGRhtEGjbSYU1DaLMs2vU_2Pbct9VFBasqpmEc01uUC3WuJicGFd066EDIdTmZRyt2GauFhhOSgXmkYj9soMYDIK8ZtGzzoP0J4KT_hKoa11hbk-tJsJw0TT52FJ1hVK3YSS59YP7lkhTI5rZ8_HJ1S32Ue7lZE1JLlBBA8Lv7DJ9qhs1doouP8gZTOTe_LD2P03-5E5YUZxzhAtku6_bs24LFkTZF3hV0B5UZmvBfHvrJbQeP6UknnGhqxGd9FSbUmzyXTbp0c6LRpImhf68ocfVx09G_00Fv7L01MOPyPr4aXdciaMB5hrmc46OgpYs7Z0w3M3DJ6UtzyU7p1jlXhaadt5J7hT_fYsnc0Z4bZhewRmPL%22%2C%22challenge%22%3A%22SMS%22%2C%22maskedContactPoint%22%3A%22***%20***%20**40%22%7D&server_timestamps=true&doc_id=7767429506681192'
 
-response = requests.post('https://accountscenter.facebook.com/api/graphql/', cookies=cookies, headers=headers, data=data)
-print(response.text)
\ No newline at end of file
+@dataclass(slots=True)
+class Author:
+    """
+    TikTok author profile with its public stats.
+    """
+    unique_id: str
+    id: str = ""
+    nickname: str = ""
+    signature: str = ""
+    sec_uid: str = ""
+    verified: bool = False
+    follower_count: int = 0
+    following_count: int = 0
+    heart_count: int = 0
+    video_count: int = 0
+    digg_count: int = 0
+    friend_count: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Author':
+        """
+        Build an author from camelCase author fields, such as a search item's `author`.
+
+        :param data: Author dictionary
+        :return: Author
+        """
+        author = cls(unique_id=data.get('uniqueId', ""))
+        author.update(data)
+        return author
+
+    @staticmethod
+    def profile_fields(user_info: Dict) -> Optional[Dict]:
+        """
+        Collect the camelCase author fields of the `userInfo` object of the user-detail API or the profile page.
+        Fields the payload leaves out are left out as well, so merging them with `update` keeps known values.
+
+        :param user_info: Dictionary with `user` and `stats` keys
+        :return: Author dictionary, or None when the payload has no user
+        """
+        user = user_info.get('user') or {}
+        if not user.get('uniqueId'):
+            return None
+        fields = {**user, **(user_info.get('stats') or {})}
+        return {key: value for key, value in fields.items() if value is not None}
+
+    def update(self, data: Dict):
+        """
+        Overwrite the attributes present in camelCase author fields; absent or null fields are kept.
+
+        :param data: Author dictionary, e.g. cached metadata
+        """
+        for key, attribute in AUTHOR_KEYS.items():
+            value = data.get(key)
+            if value is not None:
+                setattr(self, attribute, value)
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the author to TikTok's camelCase author fields.
+
+        :return: Author dictionary
+        """
+        return {
+            'uniqueId': self.unique_id,
+            'id': self.id,
+            'nickname': self.nickname,
+            'signature': self.signature,
+            'secUid': self.sec_uid,
+            'verified': self.verified,
+            'followerCount': self.follower_count,
+            'followingCount': self.following_count,
+            'heart': self.heart_count,
+            'heartCount': self.heart_count,
+            'videoCount': self.video_count,
+            'diggCount': self.digg_count,
+            'friendCount': self.friend_count,
+        }
+
+
+@dataclass(slots=True)
+class Reply:
+    """
+    Reply to a comment.
+    """
+    cid: str
+    text: str = ""
+    create_time: int = 0
+    digg_count: int = 0
+    user_unique_id: str = ""
+    user_nickname: str = ""
+    reply_to_reply_id: str = ""
+    is_author_reply: bool = False
+
+    @classmethod
+    def from_raw(cls, raw: Dict, author_unique_id: str = "") -> 'Reply':
+        """
+        Build a reply from a reply payload or `to_dict` output.
+
+        :param raw: Reply dictionary
+        :param author_unique_id: Video author's unique identifier
+        :return: Reply
+        """
+        user = raw.get('user') or {}
+        unique_id = user.get('unique_id', "")
+        return cls(
+            cid=raw['cid'],
+            text=raw.get('text', ""),
+            create_time=raw.get('create_time', 0),
+            digg_count=raw.get('digg_count', 0),
+            user_unique_id=unique_id,
+            user_nickname=user.get('nickname', ""),
+            reply_to_reply_id=raw.get('reply_to_reply_id', ""),
+            is_author_reply=raw.get('is_author_reply', unique_id == author_unique_id),
+        )
+
+    @classmethod
+    def from_item(cls, item: ReplyItem, author_unique_id: str = "") -> 'Reply':
+        """
+        Build a reply from a decoded reply item.
+
+        :param item: Reply item of a reply or comment response
+        :param author_unique_id: Video author's unique identifier
+        :return: Reply
+        """
+        unique_id = item.user.unique_id
+        return cls(
+            cid=item.cid,
+            text=item.text,
+            create_time=item.create_time,
+            digg_count=item.digg_count,
+            user_unique_id=unique_id,
+            user_nickname=item.user.nickname,
+            reply_to_reply_id=item.reply_to_reply_id,
+            is_author_reply=unique_id == author_unique_id,
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'cid': self.cid,
+            'text': self.text,
+            'create_time': self.create_time,
+            'digg_count': self.digg_count,
+            'user': {'unique_id': self.user_unique_id, 'nickname': self.user_nickname},
+            'reply_to_reply_id': self.reply_to_reply_id,
+            'is_author_reply': self.is_author_reply,
+        }
+
+
+@dataclass(slots=True)
+class Comment:
+    """
+    Top-level comment of a video with its inline reply preview and fetched replies.
+    `replies` is None until the reply thread has been resolved; `row` is the
+    comment's row in its video's comment store once it has been stored.
+    """
+    cid: str
+    text: str = ""
+    create_time: int = 0
+    digg_count: int = 0
+    user_unique_id: str = ""
+    user_nickname: str = ""
+    aweme_id: str = ""
+    reply_total: int = 0
+    inline_replies: List[Reply] = field(default_factory=list)
+    replies: Optional[List[Reply]] = None
+    is_author_reply: bool = False
+    row: Optional[int] = None
+
+    @classmethod
+    def from_raw(cls, raw: Dict, author_unique_id: str = "") -> 'Comment':
+        """
+        Build a comment from a comment payload or `to_dict` output.
+
+        :param raw: Comment dictionary
+        :param author_unique_id: Video author's unique identifier
+        :return: Comment
+        """
+        user = raw.get('user') or {}
+        unique_id = user.get('unique_id', "")
+        replies = raw.get('replies')
+        return cls(
+            cid=raw['cid'],
+            text=raw.get('text', ""),
+            create_time=raw.get('create_time', 0),
+            digg_count=raw.get('digg_count', 0),
+            user_unique_id=unique_id,
+            user_nickname=user.get('nickname', ""),
+            aweme_id=raw.get('aweme_id', ""),
+            reply_total=raw.get('reply_comment_total', 0),
+            inline_replies=[Reply.from_raw(reply, author_unique_id) for reply in raw.get('reply_comment') or ()],
+            replies=[Reply.from_raw(reply, author_unique_id) for reply in replies] if replies is not None else None,
+            is_author_reply=raw.get('is_author_reply', unique_id == author_unique_id),
+        )
+
+    @classmethod
+    def from_item(cls, item: CommentItem, author_unique_id: str = "") -> 'Comment':
+        """
+        Build a comment from a decoded comment item.
+
+        :param item: Comment item of a comment response
+        :param author_unique_id: Video author's unique identifier
+        :return: Comment
+        """
+        unique_id = item.user.unique_id
+        return cls(
+            cid=item.cid,
+            text=item.text,
+            create_time=item.create_time,
+            digg_count=item.digg_count,
+            user_unique_id=unique_id,
+            user_nickname=item.user.nickname,
+            aweme_id=item.aweme_id,
+            reply_total=item.reply_comment_total,
+            inline_replies=[Reply.from_item(reply, author_unique_id) for reply in item.reply_comment or ()],
+            is_author_reply=unique_id == author_unique_id,
+        )
+
+    def to_dict(self) -> Dict:
+        data = {
+            'cid': self.cid,
+            'text': self.text,
+            'create_time': self.create_time,
+            'digg_count': self.digg_count,
+            'user': {'unique_id': self.user_unique_id, 'nickname': self.user_nickname},
+            'aweme_id': self.aweme_id,
+            'reply_comment_total': self.reply_total,
+            'reply_comment': [reply.to_dict() for reply in self.inline_replies],
+            'is_author_reply': self.is_author_reply,
+        }
+        if self.replies is not None:
+            data['replies'] = [reply.to_dict() for reply in self.replies]
+        return data
+
+
+@dataclass(slots=True)
+class Video:
+    """
+    Crawled video record: the search item, its author and, when fetched, its comments.
+    Comments are appended to the columnar `comment_store` as they are fetched;
+    `comments` only holds the ones whose reply threads are still to be resolved.
+    `comments_partial` marks comments resumed mid-thread from a checkpoint.
+    """
+    id: str
+    author: Author
+    description: str = ""
+    create_time: int = 0
+    hashtags: List[str] = field(default_factory=list)
+    digg_count: int = 0
+    share_count: int = 0
+    play_count: int = 0
+    comment_count: int = 0
+    collect_count: int = 0
+    duration: int = 0
+    cover: str = ""
+    engagement_rate: float = 0.0
+    comments: Optional[List[Comment]] = None
+    comment_store: Optional[CommentStore] = None
+    comments_partial: bool = False
+
+    @classmethod
+    def from_search_item(cls, item: SearchItem) -> 'Video':
+        """
+        Build a video from a search result item.
+
+        :param item: Decoded search item
+        :return: Video
+        """
+        author = item.author
+        return cls(
+            id=item.id,
+            author=Author(
+                unique_id=author.uniqueId,
+                id=author.id,
+                nickname=author.nickname,
+                signature=author.signature,
+                sec_uid=author.secUid,
+                verified=author.verified,
+            ),
+            description=item.desc,
+            create_time=item.createTime,
+            hashtags=[tag.hashtagName for tag in item.textExtra or () if tag.hashtagName],
+            digg_count=item.stats.diggCount,
+            share_count=item.stats.shareCount,
+            play_count=item.stats.playCount,
+            comment_count=item.stats.commentCount,
+            collect_count=item.stats.collectCount,
+            duration=item.video.duration,
+            cover=item.video.cover,
+        )
+
+    def comment_records(self) -> Optional[List[Dict]]:
+        """
+        :return: Comment dictionaries in the layout of `Comment.to_dict`, None when comments were not fetched
+        """
+        if self.comment_store is not None:
+            return self.comment_store.to_records()
+        return None
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the video to the dataset record layout.
+
+        :return: Video record dictionary
+        """
+        data = {
+            'id': self.id,
+            'author': self.author.to_dict(),
+            'description': self.description,
+            'create_time': self.create_time,
+            'hashtags': self.hashtags,
+            'engagement_rate': self.engagement_rate,
+            'stats': {
+                'diggCount': self.digg_count,
+                'shareCount': self.share_count,
+                'playCount': self.play_count,
+                'commentCount': self.comment_count,
+                'collectCount': self.collect_count,
+            },
+            'video': {'duration': self.duration, 'cover': self.cover},
+        }
+        comments = self.comment_records()
+        if comments is not None:
+            data['comments'] = comments
+            data['comments_partial'] = self.comments_partial
+        return data
@@ -0,0 +1,134 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+
+@dataclass
+class Page:
+    """
+    One page of a paginated endpoint.
+    """
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Any = None
+    has_more: bool = False
+
+    @classmethod
+    def from_response(cls, data: dict, items_key: str, cursor: Any) -> 'Page':
+        """
+        Build a page from a TikTok list response with `has_more` and `cursor` fields.
+
+        :param data: Decoded response
+        :param items_key: Key of the item list
+        :param cursor: Cursor the page was requested with, used when the response has none or a null one
+        :return: Page
+        """
+        items = data.get(items_key) or []
+        next_cursor = data.get('cursor')
+        if next_cursor is None:
+            next_cursor = cursor
+        return cls(items=items, next_cursor=next_cursor, has_more=bool(data.get('has_more')) and bool(items))
+
+
+class AsyncPaginator:
+    """
+    Iterates the items of a cursor-paginated endpoint.
+
+    Features:
+    - Server cursors and `has_more` termination
+    - Stops when the cursor does not advance or a page is empty
+    - Maximum item and page limits
+    - Prefetches the next page while the current one is consumed
+    - Cancels the pending prefetch when iteration stops early or `aclose` is called
+
+    `cursor` runs one page ahead of the yielded items once the next page is requested;
+    `page_cursor` is the cursor of the page whose items are being yielded.
+    """
+
+    def __init__(self,
+                 fetch_page: Callable[[Any], Awaitable[Page]],
+                 start_cursor: Any = 0,
+                 max_items: Optional[int] = None,
+                 max_pages: Optional[int] = None,
+                 prefetch: bool = True,
+                 ):
+        """
+        :param fetch_page: Coroutine function fetching the page at a cursor
+        :param start_cursor: Cursor of the first page
+        :param max_items: Maximum number of items yielded
+        :param max_pages: Maximum number of pages requested
+        :param prefetch: Request the next page before the current one is consumed
+        """
+        self.fetch_page = fetch_page
+        self.cursor = start_cursor
+        self.page_cursor = start_cursor
+        self.max_items = max_items
+        self.max_pages = max_pages
+        self.prefetch = prefetch
+        self.pages = 0
+        self.yielded = 0
+        self.exhausted = False
+        self._iterator = None
+
+    def _request(self, cursor: Any) -> asyncio.Task:
+        self.pages += 1
+        return asyncio.ensure_future(self.fetch_page(cursor))
+
+    def _can_continue(self, page: Page, cursor: Any) -> bool:
+        if not page.has_more or page.next_cursor is None or page.next_cursor == cursor:
+            return False
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return False
+        return self.max_items is None or self.yielded + len(page.items) < self.max_items
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        self._iterator = self._iterate()
+        return self._iterator
+
+    async def aclose(self):
+        """
+        Stop iterating and cancel the pending prefetch.
+        """
+        if self._iterator is not None:
+            await self._iterator.aclose()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        if self.max_items is not None and self.max_items <= 0:
+            self.exhausted = True
+            return
+        pending: Optional[asyncio.Task] = self._request(self.cursor)
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                self.page_cursor = self.cursor
+                more = self._can_continue(page, self.cursor)
+                if more:
+                    self.cursor = page.next_cursor
+                    if self.prefetch:
+                        pending = self._request(self.cursor)
+                else:
+                    self.exhausted = True
+
+                for item in page.items:
+                    if self.max_items is not None and self.yielded >= self.max_items:
+                        return
+                    self.yielded += 1
+                    yield item
+
+                if more and pending is None:
+                    pending = self._request(self.cursor)
+        finally:
+            if pending is not None:
+                if pending.done():
+                    if not pending.cancelled():
+                        pending.exception()
+                else:
+                    pending.cancel()
+
+    async def collect(self) -> List[Any]:
+        """
+        Consume the paginator into a list.
+
+        :return: Every yielded item
+        """
+        return [item async for item in self]
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger('apify_client')
+
+Emit = Callable[[str, Any], Awaitable[None]]
+
+
+class Stage:
+    """
+    One pipeline stage: a handler run by a fixed number of workers over a bounded queue.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any, Emit], Awaitable[None]],
+                 workers: int = 1, queue_size: int = 0):
+        """
+        :param name: Stage name used to route jobs
+        :param handler: Coroutine called with a job and the pipeline's `emit`
+        :param workers: Number of concurrent workers
+        :param queue_size: Bound of the input queue, twice the worker count when 0
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or 2 * self.workers)
+
+
+class CrawlPipeline:
+    """
+    Staged producer/consumer engine connected by bounded queues.
+
+    Jobs may only be emitted to stages declared after the current one, so the
+    pipeline drains by joining the queues in declaration order. A full queue
+    blocks the upstream worker, which propagates backpressure to the producers.
+    """
+
+    def __init__(self, stages: List[Stage],
+                 on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+                 stop_timeout: float = 10.0):
+        """
+        :param stages: Stages in pipeline order
+        :param on_error: Called with the stage name, job and error when a handler fails
+        :param stop_timeout: Seconds `stop` waits for cancelled workers to finish
+        """
+        self.stages = stages
+        self.on_error = on_error
+        self.stop_timeout = stop_timeout
+        self._by_name: Dict[str, Stage] = {stage.name: stage for stage in stages}
+        self._workers: List[asyncio.Task] = []
+
+    async def emit(self, stage_name: str, job: Any):
+        """
+        Queue a job for a stage, waiting while its queue is full.
+
+        :param stage_name: Target stage name
+        :param job: Job passed to the stage handler
+        """
+        await self._by_name[stage_name].queue.put(job)
+
+    async def _work(self, stage: Stage):
+        while True:
+            job = await stage.queue.get()
+            try:
+                await stage.handler(job, self.emit)
+            except Exception as e:
+                logger.error(f"Pipeline stage {stage.name} failed: {e}")
+                if self.on_error is not None:
+                    self.on_error(stage.name, job, e)
+            finally:
+                stage.queue.task_done()
+
+    async def _drain(self, producers):
+        await asyncio.gather(*(producer(self.emit) for producer in producers))
+        for stage in self.stages:
+            await stage.queue.join()
+
+    async def run(self, *producers: Callable[[Emit], Awaitable[None]],
+                  stop: Union[asyncio.Event, Iterable[asyncio.Event], None] = None):
+        """
+        Start every stage, run the producers to completion and drain the queues.
+
+        :param producers: Coroutines that feed jobs through `emit`
+        :param stop: Event, or events, cancelling producers and every in-flight job as soon as one is set
+        """
+        self._workers = [
+            asyncio.create_task(self._work(stage), name=f"{stage.name}-{i}")
+            for stage in self.stages
+            for i in range(stage.workers)
+        ]
+        events = [stop] if isinstance(stop, asyncio.Event) else list(stop or ())
+        drain = asyncio.create_task(self._drain(producers))
+        stopped = [asyncio.create_task(event.wait()) for event in events]
+        try:
+            await asyncio.wait({drain, *stopped}, return_when=asyncio.FIRST_COMPLETED)
+            if drain.done():
+                drain.result()
+            else:
+                logger.info("Pipeline stop requested, cancelling in-flight jobs.")
+        finally:
+            for task in (drain, *stopped):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(drain, *stopped, return_exceptions=True)
+            await self.stop()
+
+    async def stop(self):
+        """
+        Cancel every worker, dropping queued and in-flight jobs.
+        """
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            _, pending = await asyncio.wait(self._workers, timeout=self.stop_timeout)
+            if pending:
+                logger.warning(f"{len(pending)} pipeline workers did not stop within {self.stop_timeout}s.")
+        self._workers = []
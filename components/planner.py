@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+# Author fields only available from the profile, not from the search item's author.
+PROFILE_ONLY_FIELDS = frozenset({
+    'follower_count',
+    'following_count',
+    'heart_count',
+    'video_count',
+    'digg_count',
+    'friend_count',
+})
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """
+    Which optional crawl stages the configured sinks need.
+    """
+    profile: bool = True
+    comments: bool = True
+    replies: bool = True
+
+
+def plan_fetches(fields: Iterable[str]) -> FetchPlan:
+    """
+    Derive the fetch plan from the record fields consumed by the sinks.
+
+    Fields are dotted record paths such as `author.follower_count` or
+    `comments.replies`; `*` means the whole record.
+
+    :param fields: Record fields read by every configured sink
+    :return: Fetch plan
+    """
+    fields = set(fields)
+    if '*' in fields:
+        return FetchPlan()
+
+    profile = any(
+        field.startswith('author.') and field.split('.', 1)[1] in PROFILE_ONLY_FIELDS
+        for field in fields
+    )
+    replies = any(field == 'comments.replies' or field.startswith('comments.replies.') for field in fields)
+    comments = replies or any(field == 'comments' or field.startswith('comments.') for field in fields)
+    return FetchPlan(profile=profile, comments=comments, replies=replies)
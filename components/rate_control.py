@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class _EndpointRate:
+    __slots__ = ('rate', 'next_slot', 'latency', 'last_backoff')
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.next_slot = 0.0
+        self.latency: Optional[float] = None
+        self.last_backoff = 0.0
+
+
+class AimdRateController:
+    """
+    Adaptive per-endpoint request rate using additive-increase/multiplicative-decrease.
+
+    Healthy responses raise the rate of an endpoint by roughly `increase` requests
+    per second every second. A 429, a 5xx, a transport error or a latency spike
+    above `latency_factor` times the smoothed latency multiplies the rate by
+    `decrease`, at most once per `backoff_interval` seconds. Slow responses feed
+    the smoothed latency as well, so a lasting latency shift becomes the new baseline.
+    """
+
+    def __init__(self,
+                 initial_rate: float = 5.0,
+                 min_rate: float = 0.5,
+                 max_rate: float = 50.0,
+                 increase: float = 1.0,
+                 decrease: float = 0.5,
+                 latency_factor: float = 3.0,
+                 backoff_interval: float = 1.0,
+                 ):
+        """
+        Initialize the controller.
+
+        :param initial_rate: Starting requests per second for every endpoint
+        :param min_rate: Lowest allowed requests per second
+        :param max_rate: Highest allowed requests per second
+        :param increase: Additive increase in requests per second per second
+        :param decrease: Multiplicative decrease factor applied on congestion
+        :param latency_factor: Latency multiple over the healthy average treated as congestion
+        :param backoff_interval: Minimum seconds between two decreases of one endpoint
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.backoff_interval = backoff_interval
+        self._endpoints: Dict[str, _EndpointRate] = {}
+
+    def _state(self, endpoint: str) -> _EndpointRate:
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = _EndpointRate(self.initial_rate)
+        return self._endpoints[endpoint]
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        return {endpoint: state.rate for endpoint, state in self._endpoints.items()}
+
+    async def acquire(self, endpoint: str):
+        """
+        Wait until the endpoint's pacing allows the next request.
+
+        :param endpoint: Traffic class name
+        """
+        state = self._state(endpoint)
+        now = time.monotonic()
+        slot = max(now, state.next_slot)
+        state.next_slot = slot + 1 / state.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def record(self, endpoint: str, status_code: Optional[int], latency: float):
+        """
+        Feed the outcome of a request back into the controller.
+
+        :param endpoint: Traffic class name
+        :param status_code: HTTP status, None for transport errors
+        :param latency: Request duration in seconds
+        """
+        state = self._state(endpoint)
+        throttled = status_code is None or status_code == 429 or status_code >= 500
+        slow = state.latency is not None and latency > state.latency * self.latency_factor
+        if not throttled:
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+
+        if throttled or slow:
+            now = time.monotonic()
+            if now - state.last_backoff >= self.backoff_interval:
+                state.last_backoff = now
+                state.rate = max(self.min_rate, state.rate * self.decrease)
+                state.next_slot = max(state.next_slot, now + 1 / state.rate)
+            return
+
+        state.rate = min(self.max_rate, state.rate + self.increase / state.rate)
@@ -0,0 +1,97 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from components.cache import AuthorCache
+from components.constants import headers, cookies
+from components.deadline import RunDeadline
+from components.dedup import InfluencerIndex
+from components.engagement import EngagementIndex
+from components.governor import ConcurrencyGovernor
+from components.http_client import HttpClientManager
+from components.rate_control import AimdRateController
+from components.retry import RetryEngine
+from components.singleflight import SingleFlight
+from components.sink import ApiSink, DatasetSink
+
+logger = logging.getLogger('apify_client')
+
+# Traffic classes sent to TikTok through the shared pool; the API sink has a pool of its own.
+TIKTOK_ENDPOINTS = ('search', 'profile', 'comment', 'reply')
+
+
+class CrawlResources:
+    """
+    Connection pool, traffic controls, caches, dedup and engagement indexes and sinks of a crawl.
+
+    One instance can be shared by the scrapers of several keywords, so they reuse
+    connections and cached profiles, never process the same influencer twice and
+    count towards one `max_influencers` limit.
+    """
+
+    def __init__(self,
+                 apify_client,
+                 max_influencers: int = 100,
+                 max_workers: int = 10,
+                 concurrency: Optional[Dict[str, int]] = None,
+                 author_cache: Optional[AuthorCache] = None,
+                 sinks: Tuple[str, ...] = ('api',),
+                 deadline: Optional[RunDeadline] = None,
+                 ):
+        """
+        :param apify_client: Dataset client used by the `dataset` sink
+        :param max_influencers: Maximum number of influencers over every keyword
+        :param max_workers: Base number of concurrent requests per endpoint
+        :param concurrency: Explicit limits for search, profile, comment, reply and sink traffic
+        :param author_cache: Author metadata cache, a default one owned by the resources is created otherwise
+        :param sinks: Output sinks, `api` for the influencers API and `dataset` for the Apify dataset
+        :param deadline: Run deadline, the sinks must be flushed before it
+        """
+        self._client = apify_client
+        self.deadline = deadline
+        self.influencers = InfluencerIndex(max_influencers)
+        self.governor = ConcurrencyGovernor(max_workers=max_workers, limits=concurrency)
+        # Size the pool to the governor, so the host limit never caps the configured concurrency
+        # and requests do not hold a governor slot while waiting for a connection.
+        in_flight = sum(self.governor.limits[endpoint] for endpoint in TIKTOK_ENDPOINTS)
+        self.http = HttpClientManager(headers=headers, cookies=cookies, max_connections=in_flight,
+                                      max_keepalive_connections=in_flight, per_host_limit=in_flight)
+        self.rate_controller = AimdRateController()
+        self.retry = RetryEngine()
+        self.single_flight = SingleFlight()
+        self.engagement = EngagementIndex()
+        self.sinks: List = [self._create_sink(name) for name in sinks]
+        self._owns_author_cache = author_cache is None
+        self.author_cache = author_cache or AuthorCache()
+
+    def _create_sink(self, name: str):
+        if name == 'api':
+            return ApiSink(governor=self.governor, engagement=self.engagement)
+        if name == 'dataset':
+            return DatasetSink(self._client)
+        raise ValueError(f"Unknown sink: {name}")
+
+    async def start(self):
+        """
+        Open the HTTP pool, pre-warm connections and start the sinks.
+        """
+        await self.http.start()
+        for sink in self.sinks:
+            await sink.start()
+
+    async def close(self):
+        """
+        Flush the sinks, within the time left before the run deadline, and release the HTTP pool.
+        """
+        for sink in self.sinks:
+            await sink.close(timeout=self.deadline.remaining if self.deadline is not None else None)
+        await self.http.close()
+        logger.info(f"Author cache stats: {self.author_cache.stats}")
+        if self._owns_author_cache:
+            self.author_cache.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
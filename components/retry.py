@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import msgspec
+
+from components.helpers import FetchError
+
+logger = logging.getLogger('apify_client')
+
+T = TypeVar('T')
+
+TIMEOUT = 'timeout'
+CONNECTION = 'connection'
+THROTTLED = 'throttled'
+SERVER = 'server'
+MALFORMED = 'malformed'
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    Classify a request error.
+
+    :param error: Raised exception
+    :return: Error kind when the error is transient, None when it should not be retried
+    """
+    if isinstance(error, msgspec.ValidationError):
+        return None
+    if isinstance(error, (json.JSONDecodeError, msgspec.DecodeError)):
+        return MALFORMED
+    if isinstance(error, FetchError):
+        if error.status_code == 429:
+            return THROTTLED
+        if error.status_code is not None:
+            return SERVER if error.status_code >= 500 else None
+        error = error.__cause__ or error
+    if isinstance(error, httpx.TimeoutException):
+        return TIMEOUT
+    if isinstance(error, (httpx.NetworkError, httpx.RemoteProtocolError)):
+        return CONNECTION
+    return None
+
+
+class RetryBudget:
+    """
+    Run-wide cap on retries, proportional to the number of requests sent.
+
+    Retries are allowed while they stay under `min_retries + ratio * requests`,
+    so a burst of failures cannot turn into a retry storm.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10):
+        """
+        :param ratio: Retries allowed per request sent
+        :param min_retries: Retries always allowed regardless of traffic
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+
+    def record_request(self):
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        if self.retries >= self.min_retries + self.ratio * self.requests:
+            return False
+        self.retries += 1
+        return True
+
+
+class RetryEngine:
+    """
+    Retries transient request errors with jittered exponential backoff under a shared budget.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 4,
+                 base_delay: float = 0.5,
+                 max_delay: float = 20.0,
+                 budget: Optional[RetryBudget] = None,
+                 ):
+        """
+        :param max_attempts: Maximum attempts per call, including the first one
+        :param base_delay: Backoff delay of the first retry in seconds
+        :param max_delay: Upper bound of a single backoff delay in seconds
+        :param budget: Run-wide retry budget
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+
+    def backoff(self, attempt: int, kind: str) -> float:
+        """
+        Full-jitter exponential backoff, doubled for throttling responses.
+
+        :param attempt: Zero-based number of the failed attempt
+        :param kind: Error kind returned by `classify_error`
+        :return: Delay in seconds
+        """
+        ceiling = self.base_delay * 2 ** attempt
+        if kind == THROTTLED:
+            ceiling *= 2
+        return random.uniform(0, min(self.max_delay, ceiling))
+
+    async def run(self, call: Callable[[], Awaitable[T]], description: str = "request") -> T:
+        """
+        Run `call`, retrying transient failures.
+
+        :param call: Zero-argument coroutine factory performing one attempt
+        :param description: Label used in log messages
+        :return: Result of the first successful attempt
+        :raises: The last error when it is not transient, attempts run out or the budget is spent
+        """
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as e:
+                kind = classify_error(e)
+                attempt += 1
+                if kind is None or attempt >= self.max_attempts or not self.budget.try_spend():
+                    raise
+                delay = self.backoff(attempt - 1, kind)
+                logger.info(f"Retrying {description} after {kind} error in {delay:.2f}s "
+                            f"(attempt {attempt + 1}/{self.max_attempts})")
+                await asyncio.sleep(delay)
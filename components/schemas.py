@@ -0,0 +1,190 @@
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type, Union
+
+import msgspec
+
+logger = logging.getLogger('apify_client')
+
+# Typed response schemas decoded straight from the response bytes.
+# Only the fields the crawler reads are declared, every other field is skipped
+# by the decoder without being materialized. Decoding is lax about scalar types
+# (numeric strings, booleans for flags), and list items are validated one by one
+# so a single malformed item does not discard its whole page. List items are kept
+# as Structs rather than converted to dictionaries.
+
+
+class VideoStats(msgspec.Struct):
+    diggCount: int = 0
+    shareCount: int = 0
+    playCount: int = 0
+    commentCount: int = 0
+    collectCount: int = 0
+
+
+class VideoInfo(msgspec.Struct):
+    id: str = ""
+    duration: int = 0
+    cover: str = ""
+    playAddr: str = ""
+
+
+class TextExtra(msgspec.Struct):
+    hashtagName: str = ""
+    hashtagId: str = ""
+
+
+class SearchAuthor(msgspec.Struct):
+    uniqueId: str
+    id: str = ""
+    secUid: str = ""
+    nickname: str = ""
+    signature: str = ""
+    verified: bool = False
+
+
+class SearchItem(msgspec.Struct):
+    id: str
+    author: SearchAuthor
+    desc: str = ""
+    createTime: int = 0
+    stats: VideoStats = msgspec.field(default_factory=VideoStats)
+    video: VideoInfo = msgspec.field(default_factory=VideoInfo)
+    textExtra: Optional[List[TextExtra]] = None
+
+
+class SearchResponse(msgspec.Struct):
+    status_code: int = 0
+    item_list: Optional[List[msgspec.Raw]] = None
+    has_more: Union[bool, int] = 0
+    cursor: Optional[int] = None
+
+
+class ProfileUser(msgspec.Struct, omit_defaults=True):
+    uniqueId: Optional[str] = None
+    id: Optional[str] = None
+    nickname: Optional[str] = None
+    signature: Optional[str] = None
+    secUid: Optional[str] = None
+    verified: Optional[bool] = None
+
+
+class ProfileStats(msgspec.Struct, omit_defaults=True):
+    followerCount: Optional[int] = None
+    followingCount: Optional[int] = None
+    heart: Optional[int] = None
+    heartCount: Optional[int] = None
+    videoCount: Optional[int] = None
+    diggCount: Optional[int] = None
+    friendCount: Optional[int] = None
+
+
+class UserInfo(msgspec.Struct):
+    user: Optional[ProfileUser] = None
+    stats: Optional[ProfileStats] = None
+
+
+class UserDetailResponse(msgspec.Struct):
+    statusCode: int = 0
+    userInfo: Optional[UserInfo] = None
+
+
+class DefaultScope(msgspec.Struct):
+    user_detail: Optional[UserDetailResponse] = msgspec.field(default=None, name="webapp.user-detail")
+
+
+class RehydrationData(msgspec.Struct):
+    """`__UNIVERSAL_DATA_FOR_REHYDRATION__` script of a profile page."""
+    default_scope: Optional[DefaultScope] = msgspec.field(default=None, name="__DEFAULT_SCOPE__")
+
+
+class CommentUser(msgspec.Struct):
+    unique_id: str = ""
+    nickname: str = ""
+    uid: str = ""
+
+
+class ReplyItem(msgspec.Struct):
+    cid: str
+    user: CommentUser = msgspec.field(default_factory=CommentUser)
+    text: str = ""
+    create_time: int = 0
+    digg_count: int = 0
+    aweme_id: str = ""
+    reply_id: str = ""
+    reply_to_reply_id: str = ""
+
+
+class CommentItem(msgspec.Struct):
+    cid: str
+    user: CommentUser = msgspec.field(default_factory=CommentUser)
+    text: str = ""
+    create_time: int = 0
+    digg_count: int = 0
+    aweme_id: str = ""
+    reply_comment_total: int = 0
+    reply_comment: Optional[List[ReplyItem]] = None
+    is_author_digged: bool = False
+
+
+class CommentResponse(msgspec.Struct):
+    status_code: int = 0
+    comments: Optional[List[msgspec.Raw]] = None
+    has_more: Union[bool, int] = 0
+    cursor: Optional[int] = None
+    total: int = 0
+
+
+class ReplyResponse(msgspec.Struct):
+    status_code: int = 0
+    comments: Optional[List[msgspec.Raw]] = None
+    has_more: Union[bool, int] = 0
+    cursor: Optional[int] = None
+
+
+# Item list field of each list response and the schema its items are validated with.
+ITEM_SCHEMAS = {
+    SearchResponse: ('item_list', SearchItem),
+    CommentResponse: ('comments', CommentItem),
+    ReplyResponse: ('comments', ReplyItem),
+}
+
+
+@lru_cache(maxsize=None)
+def _decoder(schema: Type) -> msgspec.json.Decoder:
+    return msgspec.json.Decoder(schema, strict=False)
+
+
+def _decode_items(raws: List[msgspec.Raw], schema: Type) -> List[msgspec.Struct]:
+    decoder = _decoder(schema)
+    items = []
+    for raw in raws:
+        try:
+            items.append(decoder.decode(raw))
+        except msgspec.ValidationError as e:
+            logger.warning(f"Skipping {schema.__name__} item: {e}")
+    return items
+
+
+def decode(raw: bytes, schema: Type) -> Dict[str, Any]:
+    """
+    Decode a JSON response body through a schema into plain dictionaries of the declared fields.
+    Items of list responses are returned as instances of their item schema, ready to be
+    turned into `components.models` objects; items that do not match it are skipped.
+
+    :param raw: Response body
+    :param schema: Response schema
+    :return: Decoded response
+    :raises msgspec.DecodeError: On malformed JSON
+    :raises msgspec.ValidationError: When the response envelope does not match the schema
+    """
+    data = _decoder(schema).decode(raw)
+    if schema not in ITEM_SCHEMAS:
+        return msgspec.to_builtins(data)
+    field, item_schema = ITEM_SCHEMAS[schema]
+    raws = getattr(data, field)
+    setattr(data, field, None)
+    result = msgspec.to_builtins(data)
+    if raws is not None:
+        result[field] = _decode_items(raws, item_schema)
+    return result
@@ -1,20 +1,44 @@
 import json
 import asyncio
-import re
 import os
+import time
 import logging
-from typing import List, Dict, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Set, Tuple
 
+import httpx
 from apify_client import ApifyClient
 
-from components.helpers import get_request_data_async, input_data_to_api
+from components.budget import CommentBudget, RequestAllowance
+from components.cache import AuthorCache
+from components.checkpoint import CrawlFrontier
+from components.comment_store import CommentStore
+from components.deadline import RunDeadline
+from components.incremental import SeenVideoStore
+from components.models import Author, Comment, Reply, Video
+from components.helpers import FetchError, ScriptBlockScanner
+from components.planner import plan_fetches
+from components.resources import CrawlResources
+from components.schemas import (
+    CommentResponse, RehydrationData, ReplyResponse, SearchItem, SearchResponse, UserDetailResponse, decode
+)
+from components.snapshots import CommentSnapshotStore
 from components.constants import (
-    headers, params_keyword, cookies,
-    params_detail, params_comment,
+    params_keyword, params_detail, params_comment,
     data_dir, params_reply
 )
-from components.input_api import fill_profile_data
+from components.paginator import AsyncPaginator, Page
+from components.pipeline import CrawlPipeline, Emit, Stage
+from components.singleflight import request_key
+
+# Hard cap on bytes read from a profile page while looking for the rehydration script.
+PROFILE_MAX_BYTES = 1_500_000
+# Profile page script holding the server-rendered user detail.
+REHYDRATION_SCRIPT_ID = '__UNIVERSAL_DATA_FOR_REHYDRATION__'
+# Author fields that must be cached and fresh before a profile fetch can be skipped.
+AUTHOR_REQUIRED_FIELDS = ('followerCount',)
+# Comments with at most this many replies carry all of them inline.
+INLINE_REPLY_LIMIT = 4
+COMMENT_PAGE_SIZE = 20
 
 
 class TikTokScraper:
@@ -33,6 +57,17 @@ class TikTokScraper:
                  keyword: str,
                  max_influencers: int = 100,
                  max_workers: int = 10,
+                 concurrency: Optional[Dict[str, int]] = None,
+                 author_cache: Optional[AuthorCache] = None,
+                 stage_workers: Optional[Dict[str, int]] = None,
+                 reply_threads_per_video: int = 4,
+                 sinks: Tuple[str, ...] = ('api',),
+                 seen_videos: Optional[SeenVideoStore] = None,
+                 frontier: Optional[CrawlFrontier] = None,
+                 comment_snapshots: Optional[CommentSnapshotStore] = None,
+                 comment_budget: Optional[CommentBudget] = None,
+                 deadline: Optional[RunDeadline] = None,
+                 resources: Optional[CrawlResources] = None,
                  log_level: int = logging.INFO,
                  ):
         """
@@ -40,17 +75,83 @@ class TikTokScraper:
 
         :param keyword: Search keyword for TikTok content
         :param max_influencers: Maximum number of influencers to scrape
-        :param max_workers: Number of concurrent threads
+        :param max_workers: Base number of concurrent requests per endpoint
+        :param concurrency: Explicit limits for search, profile, comment, reply and sink traffic
+        :param author_cache: Author metadata cache, a default one owned by the scraper is created otherwise
+        :param stage_workers: Worker count per pipeline stage (video, author, comments, replies, sink)
+        :param reply_threads_per_video: Maximum reply threads of one video fetched concurrently
+        :param sinks: Output sinks, `api` for the influencers API and `dataset` for the Apify dataset
+        :param seen_videos: Store of videos processed in earlier runs, enables incremental crawling
+        :param frontier: Checkpointed crawl state of an interrupted run to resume from
+        :param comment_snapshots: Comments of earlier cycles, only threads whose counts changed are re-crawled
+        :param comment_budget: Comment page, reply and reply-request limits and the reply thread selection strategy
+        :param deadline: Run deadline, optional work is shed as it approaches and the crawl stops when it expires
+        :param resources: Resources shared with the scrapers of other keywords; when given, `max_influencers`,
+            `max_workers`, `concurrency`, `author_cache` and `sinks` are taken from it and it is neither
+            started nor closed by the scraper
         :param log_level: Logging verbosity level
         """
         self.logger = self._setup_logger(log_level)
         self.kw = keyword
         self.total_data = []
-        self.offset = 0
+        self.frontier = frontier or CrawlFrontier()
+        self.offset = self.frontier.offset
         self.limit = 20
         self._client = apify_client
         self.max_influencers = max_influencers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.stage_workers = stage_workers or {}
+        self.reply_threads_per_video = reply_threads_per_video
+        self._owns_resources = resources is None
+        self.resources = resources or CrawlResources(
+            apify_client, max_influencers=max_influencers, max_workers=max_workers,
+            concurrency=concurrency, author_cache=author_cache, sinks=sinks, deadline=deadline
+        )
+        self.influencers = self.resources.influencers
+        self.influencers.restore(self.frontier.completed)
+        self.governor = self.resources.governor
+        self.http = self.resources.http
+        self.rate_controller = self.resources.rate_controller
+        self.retry = self.resources.retry
+        self.single_flight = self.resources.single_flight
+        self.sinks = self.resources.sinks
+        self.author_cache = self.resources.author_cache
+        self.engagement = self.resources.engagement
+        self.plan = plan_fetches(set().union(*(sink.fields for sink in self.sinks)))
+        self.seen_videos = seen_videos
+        self.known_videos: Set[str] = set()
+        # Videos skipped because their author is claimed, marked seen once that author is saved.
+        self._awaiting_author: Dict[str, List[Tuple[str, int]]] = {}
+        self.watermark = 0
+        self.comment_snapshots = comment_snapshots
+        self.comment_budget = comment_budget or CommentBudget()
+        self.deadline = deadline
+
+    async def start(self):
+        """
+        Open the shared HTTP pool, pre-warm connections and start the sinks, unless the resources are shared.
+        """
+        if self._owns_resources:
+            await self.resources.start()
+        if self.seen_videos is not None:
+            self.known_videos, self.watermark = await self.seen_videos.load(self.kw)
+            self.logger.info(f"Incremental crawl of {self.kw}: {len(self.known_videos)} known videos, "
+                             f"watermark {self.watermark}")
+
+    async def close(self):
+        """
+        Flush the sinks and release the shared HTTP pool, unless the resources are shared.
+        """
+        if self._owns_resources:
+            await self.resources.close()
+        if self.seen_videos is not None:
+            await self.seen_videos.flush()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     def _setup_logger(self, log_level: int) -> logging.Logger:
         """
@@ -61,12 +162,115 @@ class TikTokScraper:
         """
         logger = logging.getLogger('TikTokScraper')
         logger.setLevel(log_level)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
         return logger
 
+    async def _fetch(self, endpoint: str, url: str, params: Dict) -> bytes:
+        """
+        Fetch a URL through the shared pool under the endpoint's concurrency and rate limits.
+        Concurrent identical requests share one round trip.
+
+        :param endpoint: Traffic class name (search, profile, comment, reply)
+        :param url: Request URL
+        :param params: Query parameters
+        :return: Response body
+        :raises FetchError: On transport errors and non-200 responses
+        """
+        return await self.single_flight.do(
+            request_key(url, params),
+            lambda: self._send(endpoint, url, params)
+        )
+
+    async def _send(self, endpoint: str, url: str, params: Dict) -> bytes:
+        async with self.governor.slot(endpoint):
+            await self.rate_controller.acquire(endpoint)
+            self.retry.budget.record_request()
+            started = time.monotonic()
+            try:
+                response = await self.http.get(url, params=params)
+            except httpx.HTTPError as e:
+                self.rate_controller.record(endpoint, None, time.monotonic() - started)
+                raise FetchError(f"Request to {url} failed: {e}") from e
+            self.rate_controller.record(endpoint, response.status_code, time.monotonic() - started)
+
+        if response.status_code != 200:
+            raise FetchError(f"Request to {url} returned status {response.status_code}",
+                             status_code=response.status_code)
+        return response.content
+
+    async def _fetch_embedded_json(self, endpoint: str, url: str, params: Dict,
+                                   script_id: str, schema, max_bytes: int) -> Dict:
+        """
+        Stream a page and decode the JSON `<script>` block with the given id,
+        closing the connection as soon as the block is complete.
+        Concurrent identical requests share one round trip and one decode.
+
+        :param endpoint: Traffic class name
+        :param url: Request URL
+        :param params: Query parameters
+        :param script_id: Id of the script element
+        :param schema: Schema of the script's JSON from `components.schemas`
+        :param max_bytes: Maximum number of body bytes read before giving up
+        :return: Decoded script data
+        :raises FetchError: On transport errors, non-200 responses, or when the script is not found
+        """
+        return await self.single_flight.do(
+            request_key(url, params, script_id),
+            lambda: self._send_streamed(endpoint, url, params, script_id, schema, max_bytes)
+        )
+
+    async def _send_streamed(self, endpoint: str, url: str, params: Dict,
+                             script_id: str, schema, max_bytes: int) -> Dict:
+        scanner = ScriptBlockScanner(script_id)
+        raw = None
+        # HTML pages are much slower than the JSON API of the same endpoint, so they are paced on their own.
+        rate_key = f'{endpoint}_page'
+        async with self.governor.slot(endpoint):
+            await self.rate_controller.acquire(rate_key)
+            self.retry.budget.record_request()
+            started = time.monotonic()
+            try:
+                async with self.http.stream(url, params=params) as response:
+                    if response.status_code == 200:
+                        async for chunk in response.aiter_bytes():
+                            raw = scanner.feed(chunk)
+                            if raw is not None or scanner.bytes_read >= max_bytes:
+                                break
+            except httpx.HTTPError as e:
+                self.rate_controller.record(rate_key, None, time.monotonic() - started)
+                raise FetchError(f"Request to {url} failed: {e}") from e
+            self.rate_controller.record(rate_key, response.status_code, time.monotonic() - started)
+
+        if response.status_code != 200:
+            raise FetchError(f"Request to {url} returned status {response.status_code}",
+                             status_code=response.status_code)
+        if raw is None:
+            raise FetchError(f"No {script_id} script in the first {scanner.bytes_read} bytes of {url}")
+        return decode(raw, schema)
+
+    async def _fetch_json(self, endpoint: str, url: str, params: Dict, schema=None, retry: bool = True) -> Dict:
+        """
+        Fetch and decode a JSON endpoint, retrying transient failures.
+
+        :param endpoint: Traffic class name (search, profile, comment, reply)
+        :param url: Request URL
+        :param params: Query parameters
+        :param schema: Response schema from `components.schemas`; only its fields are decoded
+        :param retry: Retry transient failures, disable when the caller has a fallback
+        :return: Decoded response body
+        """
+        async def attempt():
+            raw = await self._fetch(endpoint, url, params)
+            return decode(raw, schema) if schema is not None else json.loads(raw)
+
+        if not retry:
+            return await attempt()
+        return await self.retry.run(attempt, description=f"{endpoint} request")
+
     @staticmethod
     def calculate_engagement_rate(likes: int, comments: int, shares: int, views: int) -> float:
         """
@@ -80,211 +284,560 @@ class TikTokScraper:
         """
         return (likes + comments + shares) / views * 100 if views > 0 else 0
 
-    async def get_author_metadata(self, author_unique_id: str) -> Dict:
+    async def fetch_author_detail(self, author_unique_id: str, sec_uid: str = "") -> Dict:
+        """
+        Retrieve an author's profile and stats from the JSON user-detail API.
+
+        :param author_unique_id: Unique identifier for the author
+        :param sec_uid: Author's secUid, when known
+        :return: Author fields present in the response
+        :raises FetchError: When the API fails or returns no user
+        """
+        url = 'https://www.tiktok.com/api/user/detail/'
+        params = params_detail.copy()
+        params.update({
+            'uniqueId': author_unique_id,
+            'secUid': sec_uid
+        })
+
+        # Tried once: failures fall back to the profile page instead of spending retries.
+        data = await self._fetch_json('profile', url, params, schema=UserDetailResponse, retry=False)
+        record = Author.profile_fields(data.get('userInfo') or {})
+        if data.get('statusCode', 0) != 0 or record is None:
+            raise FetchError(f"User detail API returned no user for {author_unique_id} "
+                             f"(statusCode {data.get('statusCode')})")
+        return record
+
+    async def get_author_metadata(self, author_unique_id: str, sec_uid: str = "",
+                                  refresh: bool = True) -> Dict:
         """
         Retrieve detailed metadata for a specific TikTok author.
+        Served from the author cache when fresh, otherwise fetched and cached.
 
         :param author_unique_id: Unique identifier for the author
+        :param sec_uid: Author's secUid, when known
+        :param refresh: Fetch expired or missing metadata, otherwise return whatever is cached
         :return: Author's metadata dictionary
         """
-        url = f'https://www.tiktok.com/@{author_unique_id}'
-        pattern = r'(?<="stats":)([^}]*)'
+        if not refresh:
+            return await self.author_cache.get(author_unique_id, stale_ok=True) or {}
+
+        cached = await self.author_cache.get(author_unique_id, required=AUTHOR_REQUIRED_FIELDS)
+        if cached is not None:
+            return cached
+
+        metadata = await self.fetch_author_metadata(author_unique_id, sec_uid)
+        await self.author_cache.put(author_unique_id, metadata)
+        return metadata
+
+    async def fetch_author_metadata(self, author_unique_id: str, sec_uid: str = "") -> Dict:
+        """
+        Fetch author metadata from the user-detail API, falling back to the profile page when it fails.
 
+        :param author_unique_id: Unique identifier for the author
+        :param sec_uid: Author's secUid, when known
+        :return: Author's metadata dictionary, empty when both paths fail
+        """
         try:
-            text = await get_request_data_async(
-                url=url,
-                headers=headers,
-                cookies=cookies,
-                params=params_keyword
+            return await self.fetch_author_detail(author_unique_id, sec_uid)
+        except Exception as e:
+            self.logger.info(f"User detail API failed for {author_unique_id}, using profile page: {e}")
+
+        try:
+            return await self.retry.run(
+                lambda: self.fetch_profile_page(author_unique_id),
+                description="profile request"
             )
-            match = re.search(pattern, text)
-            stats_json = match.group(0) + "}"
-            return json.loads(stats_json)
         except Exception as e:
             self.logger.error(f"Error fetching author metadata: {e}")
             return {}
 
-    async def extract_influencers(self) -> List[Dict]:
+    async def fetch_profile_page(self, author_unique_id: str) -> Dict:
         """
-        Extract influencer data from TikTok search results.
+        Retrieve an author's profile and stats from the rehydration script of their profile page.
 
-        :return: List of extracted influencer data
+        :param author_unique_id: Unique identifier for the author
+        :return: Author fields present in the script
+        :raises FetchError: When the page fails or its script holds no user
         """
-        url = 'https://www.tiktok.com/api/search/item/full/'
+        url = f'https://www.tiktok.com/@{author_unique_id}'
+        data = await self._fetch_embedded_json('profile', url, params_keyword, script_id=REHYDRATION_SCRIPT_ID,
+                                               schema=RehydrationData, max_bytes=PROFILE_MAX_BYTES)
+        user_detail = (data.get('__DEFAULT_SCOPE__') or {}).get('webapp.user-detail') or {}
+        record = Author.profile_fields(user_detail.get('userInfo') or {})
+        if record is None:
+            raise FetchError(f"Profile page of {author_unique_id} has no user detail "
+                             f"(statusCode {user_detail.get('statusCode')})")
+        return record
+
+    def _build_pipeline(self) -> CrawlPipeline:
+        """
+        Build the video → author → comments → replies → sink pipeline fed by the search producer.
+        Stages the fetch plan does not need are left out.
 
-        while len(self.total_data) < self.max_influencers:
-            try:
-                params_keyword.update({
-                    'keyword': self.kw,
-                    'offset': self.offset,
-                    'limit': self.limit
-                })
+        :return: Crawl pipeline
+        """
+        limits = self.governor.limits
+        workers = {
+            'video': limits['profile'],
+            'author': limits['profile'],
+            'comments': limits['comment'],
+            'replies': limits['reply'],
+            'sink': limits['sink'],
+            **self.stage_workers,
+        }
+        handlers = {
+            'video': self._video_stage,
+            'author': self._author_stage,
+            'comments': self._comments_stage,
+            'replies': self._replies_stage,
+            'sink': self._sink_stage,
+        }
+        skipped = {
+            'author': not self.plan.profile,
+            'comments': not self.plan.comments,
+            'replies': not self.plan.replies,
+        }
+        active = [name for name in handlers if not skipped.get(name)]
+        self._next_stage = dict(zip(active, active[1:]))
+        self.logger.info(f"Crawl stages: {' → '.join(active)}")
+
+        return CrawlPipeline(
+            [Stage(name, handlers[name], workers[name]) for name in active],
+            on_error=self._on_stage_error
+        )
 
-                data = await get_request_data_async(
-                    url=url,
-                    headers=headers,
-                    cookies=cookies,
-                    params=params_keyword
-                )
+    def _allows(self, work: str) -> bool:
+        return self.deadline is None or self.deadline.allows(work)
 
-                data_list = json.loads(data)
-                tasks = []
+    def _on_stage_error(self, stage: str, job, error: Exception):
+        if isinstance(job, Video):
+            self._release(job.author.unique_id)
+            self.frontier.finish(job.id)
+        elif stage == 'video':
+            self.frontier.finish(job.id)
 
-                for item in data_list['item_list']:
-                    task = self.process_video_item(item)
-                    tasks.append(task)
+    async def extract_influencers(self) -> List[Author]:
+        """
+        Extract influencer data from TikTok search results.
 
-                await asyncio.gather(*tasks)
+        Search pages feed a staged pipeline, so the next page is requested as soon as
+        the video stage has room instead of after the slowest video of the page.
+        The crawl stops as soon as `max_influencers` distinct influencers are saved
+        or the run deadline expires.
 
-                if len(self.total_data) >= self.max_influencers:
-                    break
+        :return: Authors of the saved videos
+        """
+        stop = [self.influencers.limit_reached]
+        if self.deadline is not None:
+            stop.append(self.deadline.expired)
+        await self._build_pipeline().run(self._search_producer, stop=stop)
+        self.logger.info(f"Crawl finished with {self.influencers.count} influencers.")
+        return self.total_data
 
-                self.offset += self.limit
+    async def fetch_search_page(self, offset: int) -> Page:
+        """
+        Fetch one page of search results.
 
-            except Exception as e:
-                self.logger.error(f"Data extraction error: {e}")
-                break
+        :param offset: Result offset
+        :return: Page of video items
+        """
+        url = 'https://www.tiktok.com/api/search/item/full/'
+        params = params_keyword.copy()
+        params.update({
+            'keyword': self.kw,
+            'offset': offset,
+            'limit': self.limit
+        })
 
-        return self.total_data
+        data = await self._fetch_json('search', url, params, schema=SearchResponse)
+        if data.get('status_code', 0) != 0:
+            raise FetchError(f"Search returned status_code {data.get('status_code')}")
+        page = Page.from_response(data, 'item_list', offset + self.limit)
+
+        if self.seen_videos is not None and page.items:
+            new_items = [item for item in page.items if item.id not in self.known_videos]
+            if not new_items and self._behind_watermark(page.items):
+                self.logger.info(f"Search page at offset {offset} has only known videos "
+                                 f"older than the watermark, stopping.")
+                return Page(next_cursor=page.next_cursor)
+            page.items = new_items
+
+        for item in page.items:
+            self.frontier.add_pending(item)
+        self.frontier.offset = page.next_cursor
+        return page
+
+    def _behind_watermark(self, items: List[SearchItem]) -> bool:
+        """
+        :param items: Search items
+        :return: True when no item was created after the watermark of earlier runs
+        """
+        return all(item.createTime <= self.watermark for item in items)
+
+    async def _mark_seen(self, video_id: str, create_time: int):
+        if self.seen_videos is not None:
+            self.known_videos.add(video_id)
+            await self.seen_videos.mark(self.kw, video_id, create_time)
+
+    def _release(self, unique_id: str, reserved: bool = False):
+        """
+        Give up an author's claim. The videos skipped for that author stay unseen,
+        so the next incremental cycle considers them again.
+        """
+        self.influencers.release(unique_id, reserved=reserved)
+        self._awaiting_author.pop(unique_id, None)
 
-    async def process_video_item(self, item: Dict):
+    async def _search_producer(self, emit: Emit):
         """
-        Process a single video item with concurrent comment extraction.
+        Re-emit the videos left pending by an interrupted run, then page through
+        search results and emit every video item.
 
-        :param item: Video item dictionary
+        :param emit: Pipeline emit function
         """
+        resumed = list(self.frontier.pending.values())
+        if resumed:
+            self.logger.info(f"Resuming {len(resumed)} pending videos from offset {self.offset}.")
+        for item in resumed:
+            if self.influencers.limit_reached.is_set():
+                return
+            await emit('video', item)
+
+        paginator = AsyncPaginator(self.fetch_search_page, start_cursor=self.offset)
         try:
-            engagement_rate = self.calculate_engagement_rate(
-                likes=item['stats']['diggCount'],
-                shares=item['stats']['shareCount'],
-                views=item['stats']['playCount'],
-                comments=item['stats']['commentCount']
-            )
+            async for item in paginator:
+                if self.influencers.limit_reached.is_set():
+                    break
+                await emit('video', item)
+        except Exception as e:
+            self.logger.error(f"Data extraction error: {e}")
+        finally:
+            await paginator.aclose()
+            self.offset = paginator.cursor
 
-            author_stats = await self.get_author_metadata(
-                author_unique_id=item['author'].get('uniqueId')
-            )
+    async def _video_stage(self, item: SearchItem, emit: Emit):
+        """
+        Build the video record of a search item whose author has not been claimed yet.
+        Every item is recorded in the engagement index, also when its author is already claimed.
+        A video skipped for a claimed author is marked seen only once that author is saved.
 
-            processed_item = {
-                'author': {**item['author'], **author_stats},
-                'video': item['video'],
-                'description': item['desc'],
-                'id': item['id'],
-                'create_time': item['createTime'],
-                'hashtags': item.get('textExtra', []),
-                'engagement_rate': engagement_rate,
-                'stats': item['stats']
-            }
-
-            comments = await self.extract_comments(
-                video_id=item['id'],
-                unique_id=item['author']['uniqueId']
-            )
-            processed_item['comments'] = comments
+        :param item: Decoded search item
+        :param emit: Pipeline emit function
+        """
+        unique_id = item.author.uniqueId
+        self.engagement.add_search_item(item)
+        if not self.influencers.claim(unique_id):
+            if unique_id in self.frontier.completed:
+                await self._mark_seen(item.id, item.createTime)
+            elif self.seen_videos is not None and self.influencers.seen(unique_id):
+                self._awaiting_author.setdefault(unique_id, []).append((item.id, item.createTime))
+            self.frontier.finish(item.id)
+            return
+
+        video = Video.from_search_item(item)
+        video.engagement_rate = self.calculate_engagement_rate(
+            likes=video.digg_count,
+            shares=video.share_count,
+            views=video.play_count,
+            comments=video.comment_count
+        )
+        await emit(self._next_stage['video'], video)
 
-            await self.save_video_data(processed_item)
-        except Exception as e:
-            self.logger.error(f"Video processing error: {e}")
+    async def _author_stage(self, video: Video, emit: Emit):
+        """
+        Merge the author's profile metadata into the record.
 
-    async def extract_comments(self, video_id: str, unique_id: str) -> List[Dict]:
+        :param video: Video record
+        :param emit: Pipeline emit function
         """
-        Extract comments for a specific video with reply handling.
+        author_stats = await self.get_author_metadata(
+            author_unique_id=video.author.unique_id,
+            sec_uid=video.author.sec_uid,
+            refresh=self._allows('profile')
+        )
+        video.author.update(author_stats)
+        await emit(self._next_stage['author'], video)
 
-        :param video_id: Unique video identifier
-        :param unique_id: Author's unique identifier
-        :return: List of comments with replies
+    async def _comments_stage(self, video: Video, emit: Emit):
         """
-        total_comments = []
-        cursor, limit = 0, 20
+        Fetch the video's comment pages, passing videos with paginated reply threads to the replies stage.
+        Videos whose `commentCount` matches their snapshot reuse the snapshot's comments.
+        Comments and paginated reply threads are skipped once the run deadline sheds them.
+        Comments and settled reply threads are appended to the video's columnar comment store as pages arrive.
 
-        while True:
-            try:
-                params = params_comment.copy()
-                params.update({
-                    'aweme_id': video_id,
-                    'cursor': cursor,
-                    'limit': limit
-                })
+        :param video: Video record
+        :param emit: Pipeline emit function
+        """
+        unique_id = video.author.unique_id
+        video.comment_store = CommentStore(video.id)
+        previous = None
+        if self.comment_snapshots is not None:
+            snapshot = await self.comment_snapshots.get(video.id)
+            if snapshot is not None:
+                if snapshot.comment_count == video.comment_count:
+                    for raw in snapshot.comments:
+                        self._store_comment(video.comment_store, Comment.from_raw(raw, unique_id))
+                    await emit('sink', video)
+                    return
+                previous = [Comment.from_raw(comment, unique_id) for comment in snapshot.comments]
+
+        if not self._allows('comments'):
+            await emit('sink', video)
+            return
+
+        # A thread resumed from a checkpointed cursor misses the pages before it.
+        video.comments_partial = bool(self.frontier.comment_cursors.get(video.id))
+        video.comments = await self.extract_comments(
+            video_id=video.id,
+            unique_id=unique_id,
+            store=video.comment_store,
+            with_replies=False,
+            previous=previous
+        )
 
-                comments = await self.extract_comment_batch(params, unique_id)
+        needs_replies = self.plan.replies and bool(video.comments)
+        if needs_replies and self._allows('replies'):
+            await emit('replies', video)
+            return
 
-                if not comments:
-                    break
+        self._use_inline_replies(video)
+        if not needs_replies:
+            await self._store_comment_snapshot(video)
+        await emit('sink', video)
 
-                total_comments.extend(comments)
-                cursor += limit
+    @staticmethod
+    def _settle(comment: Comment, replies: List[Reply], store: Optional[CommentStore]):
+        comment.replies = replies
+        if store is not None and comment.row is not None:
+            store.append_replies(comment.row, replies)
 
-                if len(total_comments) >= 100:  # Limit total comments
-                    break
+    def _store_comment(self, store: CommentStore, comment: Comment) -> bool:
+        """
+        Append a comment to the store, settling threads that fit in the inline preview.
+
+        :return: True when the comment's reply thread still has to be resolved
+        """
+        if comment.replies is None and comment.reply_total <= INLINE_REPLY_LIMIT:
+            comment.replies = self.comment_budget.inline_replies(comment)
+        row = store.append_comment(comment)
+        if comment.replies is None:
+            comment.row = row
+            return True
+        return False
+
+    def _use_inline_replies(self, video: Video):
+        for comment in video.comments or ():
+            if comment.replies is None:
+                self._settle(comment, self.comment_budget.inline_replies(comment), video.comment_store)
+        video.comments = None
+
+    async def _store_comment_snapshot(self, video: Video):
+        if self.comment_snapshots is not None and not video.comments_partial:
+            await self.comment_snapshots.put(video.id, video.comment_count, video.comment_records())
+
+    async def _replies_stage(self, video: Video, emit: Emit):
+        """
+        Fetch the reply threads of a video's comments.
 
-            except Exception as e:
-                self.logger.error(f"Comment extraction error: {e}")
-                break
+        :param video: Video record
+        :param emit: Pipeline emit function
+        """
+        resolved = False
+        try:
+            if self._allows('replies'):
+                await self.attach_replies(video.comments, video.author.unique_id, store=video.comment_store)
+                resolved = True
+        except Exception as e:
+            self.logger.error(f"Reply stage error for video {video.id}: {e}")
+        # Cancellation propagates without emitting: the sink stage may already be stopped.
+        self._use_inline_replies(video)
+        if resolved:
+            await self._store_comment_snapshot(video)
+        await emit('sink', video)
+
+    async def _sink_stage(self, video: Video, emit: Emit):
+        """
+        Hand the finished record to the sink and count the influencer.
 
-        return total_comments
+        :param video: Video record
+        :param emit: Pipeline emit function
+        """
+        unique_id = video.author.unique_id
+        if not self.influencers.reserve():
+            self._release(unique_id)
+            self.frontier.finish(video.id)
+            return
+        if await self.save_video_data(video):
+            self.influencers.complete(unique_id)
+            self.frontier.completed.add(unique_id)
+            await self._mark_seen(video.id, video.create_time)
+            for video_id, create_time in self._awaiting_author.pop(unique_id, ()):
+                await self._mark_seen(video_id, create_time)
+        else:
+            self._release(unique_id, reserved=True)
+        self.frontier.finish(video.id)
+
+    async def extract_comments(self, video_id: str, unique_id: str, store: CommentStore,
+                               with_replies: bool = True,
+                               previous: Optional[List[Comment]] = None) -> List[Comment]:
+        """
+        Extract comments for a specific video with reply handling, appending them
+        to `store` page by page. Threads that fit in the inline reply preview are
+        settled right away; the others are returned to be resolved.
+        The cursor of the page being consumed is recorded in the crawl frontier, so a
+        resumed crawl requests that page again rather than the prefetched one after it.
+        Such a resumed thread lacks the earlier pages; its record is marked with
+        `comments_partial` and it is not stored as a comment snapshot.
+
+        With `previous` comments, known comments whose reply count is unchanged keep
+        their stored replies, and pagination stops after a full page of them; the
+        remaining previous comments are appended after the fetched ones.
 
-    async def extract_comment_batch(self, params: Dict, unique_id: str) -> List[Dict]:
+        :param video_id: Unique video identifier
+        :param unique_id: Author's unique identifier
+        :param store: Comment store of the video
+        :param with_replies: Fetch each comment's replies along with the page
+        :param previous: Comments of the video's last snapshot
+        :return: Stored comments whose reply threads are unresolved
+        """
+        async def fetch_page(cursor):
+            params = params_comment.copy()
+            params.update({
+                'aweme_id': video_id,
+                'cursor': cursor,
+                'count': COMMENT_PAGE_SIZE
+            })
+            return await self.extract_comment_batch(params, unique_id, with_replies, allowance)
+
+        allowance = self.comment_budget.video_allowance()
+
+        known = {comment.cid: comment for comment in previous or ()}
+        unchanged_run = 0
+        fetched = 0
+        unresolved = []
+        start_cursor = self.frontier.comment_cursors.get(video_id, 0)
+        paginator = AsyncPaginator(fetch_page, start_cursor=start_cursor,
+                                   max_items=self.comment_budget.max_comments,
+                                   max_pages=self.comment_budget.max_comment_pages)
+        try:
+            async for comment in paginator:
+                fetched += 1
+                if video_id in self.frontier.pending:
+                    self.frontier.comment_cursors[video_id] = paginator.page_cursor
+
+                old = known.pop(comment.cid, None)
+                unchanged = old is not None and old.reply_total == comment.reply_total
+                if unchanged and comment.replies is None:
+                    comment.replies = old.replies
+                if self._store_comment(store, comment):
+                    unresolved.append(comment)
+                if unchanged:
+                    unchanged_run += 1
+                    if unchanged_run >= COMMENT_PAGE_SIZE:
+                        break
+                else:
+                    unchanged_run = 0
+        except Exception as e:
+            self.logger.error(f"Comment extraction error: {e}")
+        finally:
+            await paginator.aclose()
+
+        room = max(0, self.comment_budget.max_comments - fetched)
+        for comment in list(known.values())[:room]:
+            if self._store_comment(store, comment):
+                unresolved.append(comment)
+        return unresolved
+
+    async def extract_comment_batch(self, params: Dict, unique_id: str,
+                                    with_replies: bool = True,
+                                    allowance: Optional[RequestAllowance] = None) -> Page:
         """
         Extract a batch of comments with concurrent reply processing.
 
         :param params: Request parameters
         :param unique_id: Author's unique identifier
-        :return: List of processed comments
+        :param with_replies: Fetch each comment's replies
+        :param allowance: Reply request allowance of the video
+        :return: Page of processed comments
         """
         url = 'https://www.tiktok.com/api/comment/list/'
 
-        data = await get_request_data_async(
-            url=url,
-            headers=headers,
-            cookies=cookies,
-            params=params
-        )
+        comment_data = await self._fetch_json('comment', url, params, schema=CommentResponse)
+        page = Page.from_response(comment_data, 'comments', params['cursor'])
 
-        comment_data = json.loads(data)
-        comments = comment_data.get('comments', [])
+        page.items = [Comment.from_item(comment, unique_id) for comment in page.items]
 
-        # Mark author's comments and process replies concurrently
-        processed_comments = []
-        for comment in comments:
-            comment['is_author_reply'] = comment['user']['unique_id'] == unique_id
-            comment['replies'] = await self.extract_comment_replies(comment, unique_id)
-            processed_comments.append(comment)
+        if with_replies:
+            await self.attach_replies(page.items, unique_id, allowance)
 
-        return processed_comments
+        return page
 
-    async def extract_comment_replies(self, comment: Dict, unique_id: str) -> List[Dict]:
+    async def attach_replies(self, comments: List[Comment], unique_id: str,
+                             allowance: Optional[RequestAllowance] = None,
+                             store: Optional[CommentStore] = None):
         """
-        Extract replies for a specific comment.
+        Fetch the replies of every comment concurrently, at most `reply_threads_per_video`
+        threads at a time, and store them under each comment's `replies`.
+        Comments whose `replies` are already resolved are left as they are.
 
-        :param comment: Parent comment dictionary
+        Paginated threads are expanded in the comment budget's strategy order while the
+        reply request allowance lasts; the others keep their inline replies.
+
+        :param comments: Parent comments of one video
         :param unique_id: Author's unique identifier
-        :return: List of comment replies
+        :param allowance: Reply request allowance of the video, a fresh one when omitted
+        :param store: Comment store holding the comments, whose reply rows are appended as each thread resolves
         """
-        comment_id = comment.get('cid', '')
-        video_id = comment.get('aweme_id', '')
-        reply_count = comment.get('reply_comment_total', 0)
+        allowance = allowance or self.comment_budget.video_allowance()
+        slots = asyncio.Semaphore(self.reply_threads_per_video)
+
+        async def fetch(comment):
+            async with slots:
+                try:
+                    replies = await self.extract_comment_replies(comment, unique_id, allowance)
+                except Exception as e:
+                    self.logger.error(f"Reply extraction error for comment {comment.cid}: {e}")
+                    replies = self.comment_budget.inline_replies(comment)
+            self._settle(comment, replies, store)
+
+        pending = [comment for comment in comments if comment.replies is None]
+        expanded = self.comment_budget.select_threads(
+            [comment for comment in pending if comment.reply_total > INLINE_REPLY_LIMIT],
+            unique_id
+        )
+        selected = {id(comment) for comment in expanded}
+        for comment in pending:
+            if id(comment) not in selected:
+                self._settle(comment, self.comment_budget.inline_replies(comment), store)
 
-        if reply_count <= 4:
-            return comment.get('reply_comment', [])
+        await asyncio.gather(*(fetch(comment) for comment in expanded))
 
-        replies = []
-        cursor = 0
+    async def extract_comment_replies(self, comment: Comment, unique_id: str,
+                                      allowance: Optional[RequestAllowance] = None) -> List[Reply]:
+        """
+        Extract replies for a specific comment, at most `max_replies_per_comment` of the comment budget.
 
-        while True:
-            new_replies, cursor = await self.fetch_comment_replies(
-                comment_id, video_id, str(cursor), unique_id
-            )
+        :param comment: Parent comment
+        :param unique_id: Author's unique identifier
+        :param allowance: Reply request allowance, unlimited when omitted
+        :return: List of comment replies, the inline ones when no request is allowed
+        """
+        max_replies = self.comment_budget.max_replies_per_comment
+        inline = self.comment_budget.inline_replies(comment)
 
-            if not new_replies:
-                break
+        if comment.reply_total <= INLINE_REPLY_LIMIT:
+            return inline
 
-            replies.extend(new_replies)
-            cursor += 1
+        async def fetch_page(cursor):
+            if allowance is not None and not allowance.try_spend():
+                return Page()
+            return await self.fetch_comment_replies(comment.cid, comment.aweme_id, cursor, unique_id)
 
-        return replies
+        paginator = AsyncPaginator(fetch_page, max_items=min(comment.reply_total, max_replies))
+        return await paginator.collect() or inline
 
     async def fetch_comment_replies(self, comment_id: str, video_id: str,
-                                    cursor: str, unique_id: str) -> Tuple[List[Dict], str]:
+                                    cursor: int, unique_id: str) -> Page:
         """
         Fetch replies for a specific comment.
 
@@ -292,7 +845,7 @@ class TikTokScraper:
         :param video_id: Video ID
         :param cursor: Pagination cursor
         :param unique_id: Author's unique identifier
-        :return: Tuple of replies and new cursor
+        :return: Page of replies with the next cursor
         """
         url = "https://www.tiktok.com/api/comment/list/reply/"
         params = params_reply.copy()
@@ -302,55 +855,36 @@ class TikTokScraper:
             'cursor': cursor
         })
 
-        data = await get_request_data_async(
-            url=url,
-            headers=headers,
-            cookies=cookies,
-            params=params
-        )
-
-        reply_data = json.loads(data)
-        comments = reply_data.get('comments', [])
+        reply_data = await self._fetch_json('reply', url, params, schema=ReplyResponse)
+        page = Page.from_response(reply_data, 'comments', cursor)
 
-        # Mark author's replies
-        processed_replies = [
-            {**comment, 'is_author_reply': comment['user']['unique_id'] == unique_id}
-            for comment in comments
-        ]
+        page.items = [Reply.from_item(reply, unique_id) for reply in page.items]
 
-        return processed_replies, reply_data.get('cursor', '')
+        return page
 
-    async def save_video_data(self, item: Dict):
+    async def save_video_data(self, video: Video) -> bool:
         """
-        Save video data to JSON file with thread pool.
+        Save video data through the configured sinks.
 
-        :param item: Video data dictionary
+        :param video: Video record
+        :return: True when the record was queued
         """
-        # await asyncio.get_event_loop().run_in_executor(
-        #     self.executor,
-        #     self._save_video_sync,
-        #     item
-        # )
-        await self._save_video_sync(item=item)
-
-    async def push_data_to_api(self, json_data):
-        url = "https://dev.quokkaai.org/api/v1/influencers/"
-        input_data_to_api(url, json=json_data)
-
-
-
+        return await self._save_video_sync(video=video)
 
-    async def _save_video_sync(self, item: Dict):
+    async def _save_video_sync(self, video: Video) -> bool:
         """
-        Synchronous method to save video data to file.
+        Hand video data to every sink.
 
-        :param item: Video data dictionary
+        :param video: Video record
+        :return: True when the record was queued
         """
         try:
-            # result = await self._client.push_data(item)
-            json_data = fill_profile_data(data=item)
-            await self.push_data_to_api(json_data)
-            self.logger.info(f"Saved {item['id']} data successfully.")
+            for sink in self.sinks:
+                await sink.save(video)
+            self.total_data.append(video.author)
+            self.logger.info(f"Queued {video.id} data for upload.")
+            return True
         except Exception as e:
             self.logger.error(f"Error saving video data: {e}")
+            return False
 
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+T = TypeVar('T')
+
+
+def request_key(url: str, params: Optional[Dict] = None, *extra: Hashable) -> Tuple:
+    """
+    Build a normalized key identifying a request.
+
+    :param url: Request URL
+    :param params: Query parameters, compared independently of order and value type
+    :param extra: Additional values distinguishing requests to the same URL
+    :return: Hashable key
+    """
+    parts = urlsplit(url)
+    normalized = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', parts.query, ''))
+    query = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (normalized, query) + extra
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one execution.
+
+    While a call for a key is in flight, later callers with the same key wait
+    for it and receive the same result or exception. Nothing is kept once the
+    call completes, so results never go stale. A cancelled caller leaves the
+    call running for the others; it is cancelled once its last caller is.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            self._waiters.pop(key, None)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `call` unless an identical call is already in flight, and return its result.
+
+        :param key: Request key, see `request_key`
+        :param call: Zero-argument coroutine factory
+        :return: Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        self._waiters[key] += 1
+        try:
+            # Shield so a cancelled caller does not cancel the call shared with the others.
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._calls.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0:
+                    self._forget(key, task)
+                    task.cancel()
+            raise
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+from components.constants import INFLUENCERS_API_URL
+from components.engagement import AuthorEngagement, EngagementIndex
+from components.governor import ConcurrencyGovernor
+from components.helpers import input_data_to_api_async
+from components.http_client import HttpClientManager
+from components.input_api import PROFILE_FIELDS, fill_profile_data
+from components.models import Video
+
+logger = logging.getLogger('apify_client')
+
+_STOP = object()
+
+
+class ApiSink:
+    """
+    Asynchronous batched uploader for the influencers API.
+
+    Features:
+    - Bounded in-memory queue, producers wait when it is full
+    - Background flush workers
+    - Batching by size and by time
+    - Pooled keep-alive connection to the API
+    - Final flush on shutdown
+    """
+
+    def __init__(self,
+                 url: str = INFLUENCERS_API_URL,
+                 mapper: Callable[[Video, Optional[AuthorEngagement]], Dict] = fill_profile_data,
+                 fields: FrozenSet[str] = PROFILE_FIELDS,
+                 max_queue_size: int = 500,
+                 batch_size: int = 20,
+                 flush_interval: float = 2.0,
+                 workers: int = 2,
+                 http: Optional[HttpClientManager] = None,
+                 governor: Optional[ConcurrencyGovernor] = None,
+                 engagement: Optional[EngagementIndex] = None,
+                 ):
+        """
+        Initialize the sink. Workers are started on `start()`.
+
+        :param url: Influencers API endpoint
+        :param mapper: Converts a crawled video record and its author's engagement to the API request body
+        :param fields: Record fields read by `mapper`
+        :param max_queue_size: Maximum number of records waiting for upload
+        :param batch_size: Number of records flushed together
+        :param flush_interval: Maximum seconds a partial batch waits before flushing
+        :param workers: Number of background flush workers
+        :param http: Optional client manager, a dedicated pool is created otherwise
+        :param governor: Optional concurrency governor limiting sink traffic
+        :param engagement: Engagement index of the run, records are sent without aggregated engagement otherwise
+        """
+        self.url = url
+        self.mapper = mapper
+        self.fields = fields
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.workers = workers
+        self.http = http or HttpClientManager(warmup_urls=(url,), per_host_limit=batch_size)
+        self.governor = governor or ConcurrencyGovernor(limits={'sink': batch_size})
+        self.engagement = engagement
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.sent = 0
+        self.failed = 0
+        self._flushing = 0
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """
+        Open the API connection pool and start the flush workers.
+        """
+        if self._tasks:
+            return
+        await self.http.start()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def save(self, video: Video):
+        """
+        Enqueue a crawled video record for upload, waiting while the queue is full.
+        Records are mapped when their batch is flushed, so the author engagement
+        of a whole batch is aggregated at once and covers every video seen so far.
+
+        :param video: Video record
+        """
+        await self.queue.put(video)
+
+    async def close(self, timeout: Optional[float] = None):
+        """
+        Flush every queued record, stop the workers and close the pool.
+
+        :param timeout: Seconds the flush may take; records still queued or in flight afterwards are dropped
+        """
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout)
+            except asyncio.TimeoutError:
+                dropped = self.queue.qsize() + self._flushing
+                logger.warning(f"Sink flush timed out after {timeout:.1f}s, dropping {dropped} unsent records.")
+                self.failed += dropped
+                for task in self._tasks:
+                    task.cancel()
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            else:
+                for _ in self._tasks:
+                    await self.queue.put(_STOP)
+                await asyncio.gather(*self._tasks)
+            self._tasks = []
+        await self.http.close()
+        logger.info(f"Sink closed. Sent {self.sent} records, {self.failed} failed.")
+
+    async def _next_batch(self) -> List:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            videos = [video for video in batch if video is not _STOP]
+            try:
+                await self._flush(videos)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            if len(videos) < len(batch):
+                return
+
+    def _map(self, videos: List[Video]) -> List[Dict]:
+        engagement = {}
+        if self.engagement is not None:
+            engagement = self.engagement.compute(video.author.unique_id for video in videos)
+        return [self.mapper(video, engagement.get(video.author.unique_id)) for video in videos]
+
+    async def _flush(self, videos: List[Video]):
+        if not videos:
+            return
+        try:
+            payloads = self._map(videos)
+        except Exception as e:
+            logger.error(f"Mapping {len(videos)} records for upload failed: {e}")
+            self.failed += len(videos)
+            return
+        self._flushing += len(payloads)
+        try:
+            results = await asyncio.gather(*(self._post(p) for p in payloads), return_exceptions=True)
+        finally:
+            self._flushing -= len(payloads)
+        for result in results:
+            if result is None or isinstance(result, Exception):
+                self.failed += 1
+            else:
+                self.sent += 1
+
+    async def _post(self, payload: Dict):
+        async with self.governor.slot('sink'):
+            return await input_data_to_api_async(self.url, client=self.http, json=payload)
+
+
+class DatasetSink:
+    """
+    Pushes full crawled video records, comments and replies included, to an Apify dataset.
+    """
+
+    fields = frozenset({'*'})
+
+    def __init__(self, dataset):
+        """
+        :param dataset: Apify dataset opened with `Actor.open_dataset`
+        """
+        self.dataset = dataset
+
+    async def start(self):
+        pass
+
+    async def save(self, video: Video):
+        """
+        Push a crawled video record to the dataset.
+
+        :param video: Video record
+        """
+        await self.dataset.push_data(video.to_dict())
+
+    async def close(self, timeout: Optional[float] = None):
+        pass
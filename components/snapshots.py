@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from components.constants import data_dir
+from components.sqlite_db import SqliteDatabase
+
+logger = logging.getLogger('apify_client')
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(data_dir, "comment_snapshots.sqlite")
+# Snapshots not refreshed for this many seconds are pruned.
+DEFAULT_RETENTION = 30 * 24 * 60 * 60
+
+
+@dataclass
+class CommentSnapshot:
+    """
+    Comments of a video as of the last crawl, with the `commentCount` they were fetched at.
+    Each comment keeps its `reply_comment_total` and fetched `replies`.
+    """
+    comment_count: int
+    comments: List[Dict]
+
+
+class CommentSnapshotStore:
+    """
+    Persisted per-video comment snapshots.
+
+    Lets the crawler skip the comment threads of videos whose counts have not
+    changed since the previous cycle and reuse unchanged reply threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, retention: float = DEFAULT_RETENTION):
+        """
+        :param path: SQLite file
+        :param retention: Seconds after which a snapshot that was not refreshed is pruned
+        """
+        self.path = path
+        self.retention = retention
+        self.db = SqliteDatabase(path, self._setup)
+
+    def _setup(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS comment_snapshots ("
+            "video_id TEXT PRIMARY KEY, comment_count INTEGER NOT NULL, "
+            "comments TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("DELETE FROM comment_snapshots WHERE updated_at < ?", (time.time() - self.retention,))
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, video_id: str) -> Optional[CommentSnapshot]:
+        row = conn.execute(
+            "SELECT comment_count, comments FROM comment_snapshots WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return CommentSnapshot(comment_count=row[0], comments=json.loads(row[1]))
+
+    @staticmethod
+    def _put(conn: sqlite3.Connection, video_id: str, comment_count: int, comments: str):
+        conn.execute(
+            "INSERT OR REPLACE INTO comment_snapshots (video_id, comment_count, comments, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (video_id, comment_count, comments, time.time())
+        )
+        conn.commit()
+
+    async def get(self, video_id: str) -> Optional[CommentSnapshot]:
+        """
+        Load the last snapshot of a video.
+
+        :param video_id: Video ID
+        :return: Snapshot, or None when the video was never crawled
+        """
+        try:
+            return await self.db.call(self._get, str(video_id))
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Unable to load comment snapshot of {video_id}: {e}")
+            return None
+
+    async def put(self, video_id: str, comment_count: int, comments: List[Dict]):
+        """
+        Store the comments of a video.
+
+        :param video_id: Video ID
+        :param comment_count: Video's `commentCount` at crawl time
+        :param comments: Comments with their replies
+        """
+        try:
+            await self.db.call(self._put, str(video_id), int(comment_count or 0), json.dumps(comments))
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error(f"Unable to save comment snapshot of {video_id}: {e}")
+
+    def close(self):
+        """
+        Close the underlying SQLite connection.
+        """
+        self.db.close()
@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class SqliteDatabase:
+    """
+    SQLite file shared by the event loop's worker threads.
+
+    The connection is opened on first use, creating the file's directory and
+    running `setup` once. Statements run under one lock, and `call` runs them
+    in a worker thread so the event loop never blocks on disk I/O.
+    """
+
+    def __init__(self, path: str, setup: Optional[Callable[[sqlite3.Connection], None]] = None):
+        """
+        :param path: SQLite file
+        :param setup: Called with the new connection to create tables or prune rows
+        """
+        self.path = path
+        self.setup = setup
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.setup is not None:
+                self.setup(conn)
+                conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def run(self, work: Callable[..., T], *args) -> T:
+        """
+        Run `work(connection, *args)` in the calling thread under the connection lock.
+
+        :param work: Function running statements on the connection
+        :return: Result of `work`
+        """
+        with self._lock:
+            return work(self._connect(), *args)
+
+    async def call(self, work: Callable[..., T], *args) -> T:
+        """
+        Run `work(connection, *args)` in a worker thread under the connection lock.
+
+        :param work: Function running statements on the connection
+        :return: Result of `work`
+        """
+        return await asyncio.to_thread(self.run, work, *args)
+
+    def close(self):
+        """
+        Close the connection; the next call opens it again.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -9,17 +9,38 @@ https://docs.apify.com/sdk/python
 from __future__ import annotations
 
 import json
+import os
+from datetime import datetime, timezone
 
 from apify import Actor, Configuration
 from bs4 import BeautifulSoup
 from decouple import config
 
+from components.batch import KeywordBatch
+from components.budget import CommentBudget
+from components.cache import AuthorCache
+from components.checkpoint import CheckpointManager, CrawlFrontier
+from components.deadline import RunDeadline
 from components.helpers import logger
-from components.scraper import TikTokScraper
+from components.incremental import SeenVideoStore
+from components.snapshots import CommentSnapshotStore
 
 DATASETS_NAME = "tiktok"
 
 
+def run_deadline_seconds(actor_input: dict) -> float | None:
+    """Return the run time limit: the `run_deadline` input, else the platform timeout when one is set."""
+    if actor_input.get('run_deadline'):
+        return float(actor_input['run_deadline'])
+    timeout_at = os.environ.get('ACTOR_TIMEOUT_AT') or os.environ.get('APIFY_TIMEOUT_AT')
+    if not timeout_at:
+        return None
+    try:
+        return (datetime.fromisoformat(timeout_at) - datetime.now(timezone.utc)).total_seconds()
+    except ValueError:
+        return None
+
+
 async def main() -> None:
     """Define a main entry point for the Apify Actor.
 
@@ -34,12 +55,49 @@ async def main() -> None:
         logger.info("Dataset ID:", dataset_client._id)  # or dataset_client.id if available
 
         actor_input = await Actor.get_input() or {'keyword': 'k-beauty'}
-        keyword = "#" + actor_input.get('keyword')
+        keywords = ["#" + keyword for keyword in actor_input.get('keywords') or [actor_input.get('keyword')]]
         max_influencers = actor_input.get('max_influencers', 50)
-
-        scraper = TikTokScraper(keyword=keyword, max_influencers=max_influencers,
-                                apify_client=dataset_client)
-
-        await scraper.extract_influencers()
+        max_workers = actor_input.get('max_workers', 10)
+        concurrency = actor_input.get('concurrency')
+        stage_workers = actor_input.get('stage_workers')
+        reply_threads_per_video = actor_input.get('reply_threads_per_video', 4)
+        sinks = tuple(actor_input.get('sinks') or ('api',))
+        comment_budget = CommentBudget.from_input(actor_input.get('comment_budget'))
+        author_cache = AuthorCache(field_ttls=actor_input.get('author_cache_ttls'))
+        seen_videos = SeenVideoStore() if actor_input.get('incremental') else None
+        comment_snapshots = CommentSnapshotStore() if actor_input.get('comment_snapshots', True) else None
+        checkpoints = CheckpointManager(interval=actor_input.get('checkpoint_interval', 60))
+        deadline_seconds = run_deadline_seconds(actor_input)
+        deadline = RunDeadline(deadline_seconds, drain_reserve=actor_input.get('drain_reserve', 60),
+                               shed_at=actor_input.get('deadline_shed_at')) if deadline_seconds else None
+        if deadline is not None:
+            deadline.start()
+        checkpoint = await checkpoints.load()
+        frontiers = {keyword: CrawlFrontier.from_dict(checkpoint.get(keyword)) for keyword in keywords}
+
+        batch = KeywordBatch(keywords=keywords, max_influencers=max_influencers,
+                             max_workers=max_workers, concurrency=concurrency,
+                             stage_workers=stage_workers, reply_threads_per_video=reply_threads_per_video,
+                             sinks=sinks, author_cache=author_cache, seen_videos=seen_videos,
+                             frontiers=frontiers, comment_snapshots=comment_snapshots,
+                             comment_budget=comment_budget, deadline=deadline,
+                             apify_client=dataset_client)
+
+        checkpoints.start(batch.frontiers)
+        finished = False
+        try:
+            await batch.run()
+            finished = deadline is None or not deadline.expired.is_set()
+        finally:
+            if deadline is not None:
+                await deadline.stop()
+            await checkpoints.stop(persist=not finished)
+            if finished:
+                await checkpoints.clear()
+            author_cache.close()
+            if seen_videos is not None:
+                await seen_videos.close()
+            if comment_snapshots is not None:
+                comment_snapshots.close()
 
 
@@ -0,0 +1,52 @@
+import pytest
+
+from components.budget import CommentBudget
+from components.models import Comment, Reply
+
+
+def comment(cid, create_time=0, digg_count=0, user="fan", inline_users=()):
+    return Comment(cid=cid, create_time=create_time, digg_count=digg_count, user_unique_id=user,
+                   inline_replies=[Reply(cid=f"{cid}-{i}", user_unique_id=u) for i, u in enumerate(inline_users)])
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        CommentBudget(strategy='random')
+
+
+def test_from_input_keeps_defaults_for_missing_keys():
+    budget = CommentBudget.from_input({'max_comments': 10})
+
+    assert budget.max_comments == 10
+    assert budget.max_replies_per_comment == CommentBudget().max_replies_per_comment
+
+
+def test_threads_are_selected_in_strategy_order():
+    comments = [comment('a', create_time=1, digg_count=30), comment('b', create_time=3, digg_count=10),
+                comment('c', create_time=2, digg_count=20, inline_users=('creator',))]
+
+    assert [c.cid for c in CommentBudget(strategy='newest').select_threads(comments, 'creator')] == ['b', 'c', 'a']
+    assert [c.cid for c in CommentBudget(strategy='most_liked').select_threads(comments, 'creator')] == ['a', 'c', 'b']
+    assert [c.cid for c in CommentBudget(strategy='author_reply_only').select_threads(comments, 'creator')] == ['c']
+
+
+def test_inline_replies_are_capped_per_comment():
+    budget = CommentBudget(max_replies_per_comment=2)
+
+    assert [r.cid for r in budget.inline_replies(comment('a', inline_users=('x', 'y', 'z')))] == ['a-0', 'a-1']
+
+
+def test_allowances_draw_from_the_video_and_run_budgets():
+    budget = CommentBudget(reply_requests_per_video=2, reply_requests_per_run=3)
+    first, second = budget.video_allowance(), budget.video_allowance()
+
+    assert [first.try_spend() for _ in range(3)] == [True, True, False]
+    assert [second.try_spend() for _ in range(2)] == [True, False]
+    assert budget.run_requests == 3
+
+
+def test_unlimited_allowance():
+    budget = CommentBudget(reply_requests_per_video=None)
+    allowance = budget.video_allowance()
+
+    assert all(allowance.try_spend() for _ in range(100))
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from components.cache import AuthorCache, MemoryLRU
+
+
+def test_memory_lru_evicts_least_recently_used_within_its_byte_budget():
+    lru = MemoryLRU(max_bytes=10)
+    lru.put('a', {'v': 1}, 4)
+    lru.put('b', {'v': 2}, 4)
+    lru.get('a')
+    lru.put('c', {'v': 3}, 4)
+
+    assert lru.get('b') is None
+    assert lru.get('a') == {'v': 1}
+    assert lru.get('c') == {'v': 3}
+    assert lru.size == 8
+
+
+def test_memory_lru_skips_values_larger_than_its_budget():
+    lru = MemoryLRU(max_bytes=10)
+    lru.put('a', {'v': 1}, 4)
+    lru.put('a', {'v': 2}, 11)
+
+    assert lru.get('a') is None
+    assert lru.size == 0
+
+
+def test_fields_expire_after_their_own_ttl():
+    async def main():
+        cache = AuthorCache(path=None, field_ttls={'followerCount': 60}, default_ttl=3600)
+        await cache.put('creator', {'followerCount': 10, 'nickname': 'C'})
+        entry = cache.memory.get('creator')
+        entry['followerCount'][1] = time.time() - 120
+        return (await cache.get('creator'),
+                await cache.get('creator', required=['followerCount']),
+                await cache.get('creator', required=['followerCount'], stale_ok=True))
+
+    fresh, required, stale = asyncio.run(main())
+
+    assert fresh == {'nickname': 'C'}
+    assert required is None
+    assert stale == {'followerCount': 10, 'nickname': 'C'}
+
+
+def test_put_merges_with_the_cached_fields():
+    async def main():
+        cache = AuthorCache(path=None)
+        await cache.put('creator', {'nickname': 'C', 'followerCount': 1})
+        await cache.put('creator', {'followerCount': 2})
+        return await cache.get('creator'), await cache.get('someone-else'), cache.stats
+
+    fields, miss, stats = asyncio.run(main())
+
+    assert fields == {'nickname': 'C', 'followerCount': 2}
+    assert miss is None
+    assert stats == {'memory_hits': 1, 'disk_hits': 0, 'misses': 1, 'writes': 2}
+
+
+def test_disk_tier_serves_a_new_cache(tmp_path):
+    path = str(tmp_path / "authors.sqlite")
+
+    async def first_run():
+        cache = AuthorCache(path=path)
+        await cache.put('creator', {'nickname': 'C'})
+        cache.close()
+
+    async def second_run():
+        cache = AuthorCache(path=path)
+        try:
+            return await cache.get('creator'), await cache.get('creator'), cache.stats
+        finally:
+            cache.close()
+
+    asyncio.run(first_run())
+    from_disk, from_memory, stats = asyncio.run(second_run())
+
+    assert from_disk == from_memory == {'nickname': 'C'}
+    assert stats['disk_hits'] == 1
+    assert stats['memory_hits'] == 1
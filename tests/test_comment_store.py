@@ -0,0 +1,52 @@
+from components.comment_store import NO_PARENT, CommentStore
+from components.models import Comment, Reply
+
+
+def reply(cid, reply_to="0", user="fan"):
+    return Reply(cid=cid, text=f"re {cid}", user_unique_id=user, user_nickname=user.title(),
+                 reply_to_reply_id=reply_to)
+
+
+def comment(cid, replies=None, reply_total=0):
+    return Comment(cid=cid, text=f"comment {cid} ✓", create_time=1700000000, digg_count=3,
+                   user_unique_id="fan", user_nickname="Fan", aweme_id="42",
+                   reply_total=reply_total, replies=replies)
+
+
+def test_records_round_trip_the_nested_layout():
+    comments = [comment("11", [reply("21"), reply("22", reply_to="21"), reply("23", reply_to="")], 3),
+                comment("12", [])]
+    store = CommentStore.from_comments(comments, "42")
+
+    records = store.to_records()
+
+    for record, original in zip(records, comments):
+        expected = original.to_dict()
+        del expected['reply_comment']
+        assert {key: value for key, value in record.items() if key != 'reply_comment'} == expected
+    assert [r['reply_to_reply_id'] for r in records[0]['replies']] == ["0", "21", ""]
+
+
+def test_replies_appended_later_are_grouped_under_their_comment():
+    store = CommentStore("42")
+    first = store.append_comment(comment("11"))
+    store.append_comment(comment("12", []))
+    store.append_replies(first, [reply("21"), reply("22")])
+
+    records = store.to_records()
+
+    assert [record['cid'] for record in records] == ["11", "12"]
+    assert [r['cid'] for r in records[0]['replies']] == ["21", "22"]
+    assert records[1]['replies'] == []
+    assert list(store.parent) == [NO_PARENT, NO_PARENT, first, first]
+
+
+def test_authors_are_interned_and_columns_exported_without_copies():
+    store = CommentStore.from_comments([comment("11", [reply("21", user="fan"), reply("22", user="other")])])
+
+    assert store.authors == [("fan", "Fan"), ("other", "Other")]
+    assert list(store.author) == [0, 0, 1]
+    columns = store.columns()
+    assert columns['cid'].obj is store.cid
+    assert len(columns['text_offsets']) == len(store) + 1
+    assert store.text_at(0) == "comment 11 ✓"
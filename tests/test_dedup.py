@@ -0,0 +1,60 @@
+from components.dedup import InfluencerIndex
+
+
+def test_an_author_is_claimed_once():
+    index = InfluencerIndex(max_influencers=5)
+
+    assert index.claim('a')
+    assert not index.claim('a')
+    assert index.seen('a')
+
+
+def test_release_allows_a_new_claim_until_completed():
+    index = InfluencerIndex(max_influencers=5)
+    index.claim('a')
+    index.release('a')
+    assert index.claim('a')
+
+    assert index.reserve()
+    index.complete('a')
+    index.release('a')
+    assert not index.claim('a')
+
+
+def test_reservations_never_exceed_the_limit():
+    index = InfluencerIndex(max_influencers=2)
+
+    assert index.reserve()
+    assert index.reserve()
+    assert not index.reserve()
+
+    index.release('a', reserved=True)
+    assert index.reserve()
+
+
+def test_completing_the_limit_sets_the_event_and_blocks_claims():
+    index = InfluencerIndex(max_influencers=2)
+    for unique_id in ('a', 'b'):
+        assert index.claim(unique_id)
+        assert index.reserve()
+
+    assert not index.complete('a')
+    assert not index.limit_reached.is_set()
+    assert index.complete('b')
+    assert index.limit_reached.is_set()
+    assert index.count == 2
+    assert not index.claim('c')
+    assert not index.reserve()
+
+
+def test_restore_seeds_completed_authors():
+    index = InfluencerIndex(max_influencers=3)
+    index.restore(['a', 'b'])
+
+    assert index.count == 2
+    assert not index.claim('a')
+    assert index.claim('c')
+    assert not index.limit_reached.is_set()
+
+    index.restore(['c'])
+    assert index.limit_reached.is_set()
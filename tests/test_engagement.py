@@ -0,0 +1,55 @@
+import msgspec
+
+from components.engagement import EngagementIndex
+from components.schemas import SearchItem
+
+# 2023-11-13 00:00:00 UTC, a Monday.
+MONDAY = 1699833600
+HOUR = 3600
+DAY = 86400
+
+
+def test_statistics_are_grouped_per_author():
+    index = EngagementIndex()
+    index.add('a', '1', MONDAY + 23 * HOUR, likes=8, comments=1, shares=1, views=100)
+    index.add('a', '2', MONDAY + DAY + 1 * HOUR, likes=20, comments=0, shares=0, views=100)
+    index.add('b', '3', MONDAY + 12 * HOUR, likes=5, comments=0, shares=0, views=0)
+
+    stats = index.compute()
+
+    assert stats['a'].video_count == 2
+    assert stats['a'].mean_engagement == 15.0
+    assert stats['a'].engagement_by_day == {'Monday': 10.0, 'Tuesday': 20.0}
+    assert stats['a'].avg_posting_time == "00:00"
+    assert stats['b'].mean_engagement == 0.0
+    assert stats['b'].avg_posting_time == "12:00"
+
+
+def test_duplicate_videos_are_ignored():
+    index = EngagementIndex()
+
+    assert index.add('a', '1', MONDAY, likes=1, comments=0, shares=0, views=10)
+    assert not index.add('a', '1', MONDAY, likes=9, comments=0, shares=0, views=10)
+    assert len(index) == 1
+
+
+def test_compute_selects_known_authors():
+    index = EngagementIndex()
+    index.add('a', '1', MONDAY, likes=1, comments=0, shares=0, views=10)
+    index.add('b', '2', MONDAY, likes=2, comments=0, shares=0, views=10)
+
+    assert list(index.compute(['b', 'missing', 'b'])) == ['b']
+    assert index.compute(['missing']) == {}
+
+
+def test_search_items_are_recorded():
+    item = msgspec.convert({
+        'id': '1',
+        'createTime': MONDAY,
+        'author': {'uniqueId': 'a'},
+        'stats': {'diggCount': 3, 'commentCount': 1, 'shareCount': 1, 'playCount': 50},
+    }, SearchItem)
+    index = EngagementIndex()
+
+    assert index.add_search_item(item)
+    assert index.compute()['a'].mean_engagement == 10.0
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from components.helpers import ScriptBlockScanner
+from components.schemas import RehydrationData, decode
+
+SCRIPT_ID = '__UNIVERSAL_DATA_FOR_REHYDRATION__'
+DATA = {'__DEFAULT_SCOPE__': {'webapp.user-detail': {
+    'statusCode': 0,
+    'userInfo': {'user': {'uniqueId': 'creator', 'id': '6812345'}, 'stats': {'followerCount': 1200}},
+}}}
+SCRIPT = json.dumps(DATA).encode()
+PAGE = (
+    b'<html><head><script id="other">{"stats": {"followerCount": 1}}</script>'
+    b'<script id="' + SCRIPT_ID.encode() + b'" type="application/json">' + SCRIPT + b'</script>'
+    b'</head><body>' + b'x' * 1000 + b'</body></html>'
+)
+
+
+def scan(page: bytes, chunk_size: int):
+    scanner = ScriptBlockScanner(SCRIPT_ID)
+    for start in range(0, len(page), chunk_size):
+        raw = scanner.feed(page[start:start + chunk_size])
+        if raw is not None:
+            return raw, scanner
+    return None, scanner
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64])
+def test_script_body_is_found_across_any_chunk_boundary(chunk_size):
+    raw, scanner = scan(PAGE, chunk_size)
+
+    assert raw == SCRIPT
+    assert scanner.bytes_read < len(PAGE)
+
+
+def test_scanner_keeps_only_a_marker_sized_tail_before_the_script():
+    scanner = ScriptBlockScanner(SCRIPT_ID)
+    for _ in range(100):
+        assert scanner.feed(b'<div>' + b'y' * 1000 + b'</div>') is None
+
+    assert len(scanner.buffer) < len(scanner.marker)
+
+
+def test_missing_script_returns_nothing():
+    page = PAGE.replace(SCRIPT_ID.encode(), b'something-else')
+    raw, scanner = scan(page, 64)
+
+    assert raw is None
+    assert scanner.bytes_read == len(page)
+
+
+def test_script_body_decodes_to_the_user_detail():
+    raw, _ = scan(PAGE, 64)
+
+    data = decode(raw, RehydrationData)
+    user_info = data['__DEFAULT_SCOPE__']['webapp.user-detail']['userInfo']
+
+    assert user_info['user']['id'] == '6812345'
+    assert user_info['stats']['followerCount'] == 1200
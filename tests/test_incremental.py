@@ -0,0 +1,39 @@
+import asyncio
+
+from components.incremental import SeenVideoStore
+
+
+def test_marked_videos_and_watermark_survive_a_reopen(tmp_path):
+    path = str(tmp_path / "seen.sqlite")
+
+    async def first_run():
+        store = SeenVideoStore(path, flush_every=2)
+        await store.mark('#kw', '1', 100)
+        await store.mark('#kw', '2', 300)
+        await store.mark('#other', '3', 500)
+        await store.close()
+
+    async def second_run():
+        store = SeenVideoStore(path)
+        try:
+            return await store.load('#kw'), await store.load('#new')
+        finally:
+            await store.close()
+
+    asyncio.run(first_run())
+    assert asyncio.run(second_run()) == (({'1', '2'}, 300), (set(), 0))
+
+
+def test_videos_older_than_the_retention_are_pruned(tmp_path):
+    async def main():
+        store = SeenVideoStore(str(tmp_path / "seen.sqlite"), retention=100, flush_every=10)
+        await store.mark('#kw', 'old', 1000)
+        await store.mark('#kw', 'recent', 1950)
+        await store.mark('#kw', 'newest', 2000)
+        await store.flush()
+        try:
+            return await store.load('#kw')
+        finally:
+            await store.close()
+
+    assert asyncio.run(main()) == ({'recent', 'newest'}, 2000)
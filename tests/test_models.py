@@ -0,0 +1,55 @@
+import json
+
+from components.models import Author
+from components.schemas import UserDetailResponse, decode
+
+
+def search_author():
+    return Author.from_dict({
+        'uniqueId': 'creator',
+        'id': '6812345',
+        'secUid': 'MS4w',
+        'nickname': 'Creator',
+        'signature': 'Hello',
+        'verified': True,
+    })
+
+
+def test_profile_merge_keeps_search_item_fields_the_payload_leaves_out():
+    body = json.dumps({
+        'statusCode': 0,
+        'userInfo': {
+            'user': {'uniqueId': 'creator', 'nickname': 'Creator 2'},
+            'stats': {'followerCount': 1200, 'heartCount': 50000},
+        },
+    }).encode()
+    fields = Author.profile_fields(decode(body, UserDetailResponse)['userInfo'])
+
+    author = search_author()
+    author.update(fields)
+
+    assert author.id == '6812345'
+    assert author.verified is True
+    assert author.signature == 'Hello'
+    assert author.nickname == 'Creator 2'
+    assert author.follower_count == 1200
+    assert author.heart_count == 50000
+
+
+def test_profile_merge_applies_fields_the_payload_holds():
+    fields = Author.profile_fields({
+        'user': {'uniqueId': 'creator', 'id': '6812345', 'verified': False, 'signature': ''},
+        'stats': {'followerCount': 0},
+    })
+
+    author = search_author()
+    author.update(fields)
+
+    assert author.verified is False
+    assert author.signature == ''
+    assert author.follower_count == 0
+
+
+def test_profile_fields_need_a_user():
+    assert Author.profile_fields({'user': {}, 'stats': {'followerCount': 1}}) is None
+    assert Author.profile_fields({}) is None
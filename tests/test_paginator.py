@@ -0,0 +1,99 @@
+import asyncio
+
+from components.paginator import AsyncPaginator, Page
+
+
+def make_fetch(pages, requested):
+    async def fetch(cursor):
+        requested.append(cursor)
+        return pages[cursor]
+    return fetch
+
+
+def test_page_falls_back_to_the_requested_cursor():
+    assert Page.from_response({'items': [1], 'cursor': None, 'has_more': 1}, 'items', 20).next_cursor == 20
+    assert Page.from_response({'items': [1], 'has_more': 1}, 'items', 20).next_cursor == 20
+    assert Page.from_response({'items': [1], 'cursor': 0, 'has_more': 1}, 'items', 20).next_cursor == 0
+
+
+def test_page_without_items_has_no_more():
+    assert not Page.from_response({'items': None, 'cursor': 5, 'has_more': 1}, 'items', 0).has_more
+
+
+def test_follows_cursors_until_has_more_is_false():
+    pages = {
+        0: Page([1, 2], next_cursor=2, has_more=True),
+        2: Page([3, 4], next_cursor=4, has_more=True),
+        4: Page([5], next_cursor=5, has_more=False),
+    }
+    requested = []
+    paginator = AsyncPaginator(make_fetch(pages, requested))
+
+    assert asyncio.run(paginator.collect()) == [1, 2, 3, 4, 5]
+    assert requested == [0, 2, 4]
+    assert paginator.exhausted
+
+
+def test_stops_when_the_cursor_does_not_advance():
+    pages = {0: Page([1, 2], next_cursor=0, has_more=True)}
+    requested = []
+
+    assert asyncio.run(AsyncPaginator(make_fetch(pages, requested)).collect()) == [1, 2]
+    assert requested == [0]
+
+
+def test_max_items_limits_items_and_requests():
+    pages = {cursor: Page([cursor, cursor + 1], next_cursor=cursor + 2, has_more=True) for cursor in range(0, 20, 2)}
+    requested = []
+    paginator = AsyncPaginator(make_fetch(pages, requested), max_items=3)
+
+    assert asyncio.run(paginator.collect()) == [0, 1, 2]
+    assert requested == [0, 2]
+
+
+def test_max_pages_limits_requests():
+    pages = {cursor: Page([cursor], next_cursor=cursor + 1, has_more=True) for cursor in range(10)}
+    requested = []
+
+    assert asyncio.run(AsyncPaginator(make_fetch(pages, requested), max_pages=3).collect()) == [0, 1, 2]
+    assert requested == [0, 1, 2]
+
+
+def test_early_stop_cancels_the_prefetch():
+    cancelled = []
+
+    async def fetch(cursor):
+        if cursor:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(cursor)
+                raise
+        return Page([cursor], next_cursor=cursor + 1, has_more=True)
+
+    async def main():
+        paginator = AsyncPaginator(fetch)
+        async for _ in paginator:
+            await asyncio.sleep(0)
+            break
+        await paginator.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [1]
+
+
+def test_page_cursor_trails_the_prefetched_cursor():
+    pages = {cursor: Page([cursor, cursor + 1], next_cursor=cursor + 2, has_more=True) for cursor in range(0, 10, 2)}
+    seen = []
+
+    async def main():
+        paginator = AsyncPaginator(make_fetch(pages, []))
+        async for item in paginator:
+            seen.append((item, paginator.page_cursor, paginator.cursor))
+            if item == 3:
+                break
+        await paginator.aclose()
+
+    asyncio.run(main())
+    assert seen == [(0, 0, 2), (1, 0, 2), (2, 2, 4), (3, 2, 4)]
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+from components.pipeline import CrawlPipeline, Stage
+
+
+def test_drains_every_stage():
+    collected = []
+
+    async def produce(emit):
+        for i in range(10):
+            await emit('double', i)
+
+    async def double(job, emit):
+        await emit('collect', job * 2)
+
+    async def collect(job, emit):
+        collected.append(job)
+
+    pipeline = CrawlPipeline([Stage('double', double, 2), Stage('collect', collect)])
+    asyncio.run(pipeline.run(produce))
+
+    assert sorted(collected) == [i * 2 for i in range(10)]
+
+
+def test_handler_errors_are_reported_and_do_not_stop_the_stage():
+    errors = []
+    collected = []
+
+    async def produce(emit):
+        for i in range(4):
+            await emit('work', i)
+
+    async def work(job, emit):
+        if job == 1:
+            raise ValueError("bad job")
+        collected.append(job)
+
+    pipeline = CrawlPipeline([Stage('work', work)],
+                             on_error=lambda stage, job, error: errors.append((stage, job, str(error))))
+    asyncio.run(pipeline.run(produce))
+
+    assert sorted(collected) == [0, 2, 3]
+    assert errors == [('work', 1, "bad job")]
+
+
+def test_stop_does_not_hang_on_a_full_downstream_queue():
+    async def main():
+        stop = asyncio.Event()
+
+        async def produce(emit):
+            for i in range(100):
+                await emit('upstream', i)
+
+        async def upstream(job, emit):
+            if job == 3:
+                stop.set()
+            await emit('downstream', job)
+
+        async def downstream(job, emit):
+            await asyncio.sleep(60)
+
+        pipeline = CrawlPipeline([Stage('upstream', upstream, 2),
+                                  Stage('downstream', downstream, 1, queue_size=1)])
+        await asyncio.wait_for(pipeline.run(produce, stop=stop), 5)
+
+    started = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - started < 5
+
+
+def test_stop_is_bounded_by_the_stop_timeout():
+    async def main():
+        stop = asyncio.Event()
+
+        async def produce(emit):
+            await emit('stubborn', None)
+            stop.set()
+
+        async def stubborn(job, emit):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                await asyncio.sleep(60)
+
+        pipeline = CrawlPipeline([Stage('stubborn', stubborn)], stop_timeout=0.1)
+        await asyncio.wait_for(pipeline.run(produce, stop=stop), 5)
+
+    started = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - started < 5
@@ -0,0 +1,20 @@
+from components.input_api import PROFILE_FIELDS
+from components.planner import FetchPlan, plan_fetches
+
+
+def test_api_sink_needs_profiles_but_no_comments():
+    assert plan_fetches(PROFILE_FIELDS) == FetchPlan(profile=True, comments=False, replies=False)
+
+
+def test_whole_record_needs_every_stage():
+    assert plan_fetches({'author.nickname', '*'}) == FetchPlan()
+
+
+def test_search_item_fields_need_no_optional_stage():
+    assert plan_fetches({'author.nickname', 'author.verified', 'play_count'}) == \
+        FetchPlan(profile=False, comments=False, replies=False)
+
+
+def test_comment_fields_need_comments_and_reply_fields_need_both():
+    assert plan_fetches({'comments.text'}) == FetchPlan(profile=False, comments=True, replies=False)
+    assert plan_fetches({'comments.replies.text'}) == FetchPlan(profile=False, comments=True, replies=True)
@@ -0,0 +1,69 @@
+from components.rate_control import AimdRateController
+
+
+def controller(**kwargs):
+    options = {'initial_rate': 10.0, 'min_rate': 0.5, 'max_rate': 50.0, 'backoff_interval': 0.0}
+    options.update(kwargs)
+    return AimdRateController(**options)
+
+
+def test_healthy_responses_increase_the_rate():
+    rates = controller()
+    for _ in range(10):
+        rates.record('search', 200, 0.1)
+
+    assert 10.0 < rates.rates['search'] <= 50.0
+
+
+def test_rate_is_capped_at_max_rate():
+    rates = controller(max_rate=12.0)
+    for _ in range(1000):
+        rates.record('search', 200, 0.1)
+
+    assert rates.rates['search'] == 12.0
+
+
+def test_throttling_halves_the_rate_down_to_min_rate():
+    rates = controller()
+    rates.record('search', 429, 0.1)
+    assert rates.rates['search'] == 5.0
+
+    rates.record('search', 503, 0.1)
+    rates.record('search', None, 0.1)
+    assert rates.rates['search'] == 1.25
+
+    for _ in range(10):
+        rates.record('search', 429, 0.1)
+    assert rates.rates['search'] == 0.5
+
+
+def test_decreases_are_spaced_by_the_backoff_interval():
+    rates = controller(backoff_interval=60.0)
+    rates.record('search', 429, 0.1)
+    rates.record('search', 429, 0.1)
+
+    assert rates.rates['search'] == 5.0
+
+
+def test_endpoints_are_independent():
+    rates = controller()
+    rates.record('search', 429, 0.1)
+    rates.record('comments', 200, 0.1)
+
+    assert rates.rates['search'] == 5.0
+    assert rates.rates['comments'] > 10.0
+
+
+def test_a_lasting_latency_shift_becomes_the_new_baseline():
+    rates = controller()
+    for _ in range(20):
+        rates.record('search', 200, 0.1)
+
+    history = []
+    for _ in range(50):
+        rates.record('search', 200, 1.0)
+        history.append(rates.rates['search'])
+
+    decreases = sum(1 for before, after in zip(history, history[1:]) if after < before)
+    assert decreases <= 2
+    assert history[-1] > min(history)
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import httpx
+import msgspec
+import pytest
+
+from components.helpers import FetchError
+from components.retry import (CONNECTION, MALFORMED, SERVER, THROTTLED, TIMEOUT, RetryBudget, RetryEngine,
+                              classify_error)
+
+
+def fetch_error(cause: BaseException) -> FetchError:
+    try:
+        raise FetchError("request failed") from cause
+    except FetchError as e:
+        return e
+
+
+@pytest.mark.parametrize('error, kind', [
+    (FetchError("throttled", 429), THROTTLED),
+    (FetchError("unavailable", 503), SERVER),
+    (FetchError("not found", 404), None),
+    (fetch_error(httpx.ReadTimeout("slow")), TIMEOUT),
+    (fetch_error(httpx.ConnectError("refused")), CONNECTION),
+    (httpx.RemoteProtocolError("reset"), CONNECTION),
+    (json.JSONDecodeError("bad", "{", 0), MALFORMED),
+    (msgspec.DecodeError("truncated"), MALFORMED),
+    (msgspec.ValidationError("wrong shape"), None),
+    (ValueError("bug"), None),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_budget_allows_min_retries_plus_a_share_of_requests():
+    budget = RetryBudget(ratio=0.1, min_retries=2)
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+    for _ in range(10):
+        budget.record_request()
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+
+def engine(**kwargs) -> RetryEngine:
+    options = {'max_attempts': 3, 'base_delay': 0.0, 'budget': RetryBudget(min_retries=100)}
+    options.update(kwargs)
+    return RetryEngine(**options)
+
+
+def flaky(*errors):
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) <= len(errors):
+            raise errors[len(attempts) - 1]
+        return 'ok'
+
+    return call, attempts
+
+
+def test_transient_errors_are_retried():
+    call, attempts = flaky(FetchError("throttled", 429), fetch_error(httpx.ReadTimeout("slow")))
+
+    assert asyncio.run(engine().run(call)) == 'ok'
+    assert len(attempts) == 3
+
+
+def test_permanent_errors_are_not_retried():
+    call, attempts = flaky(FetchError("not found", 404))
+
+    with pytest.raises(FetchError):
+        asyncio.run(engine().run(call))
+    assert len(attempts) == 1
+
+
+def test_attempts_are_capped():
+    call, attempts = flaky(*[FetchError("unavailable", 503)] * 5)
+
+    with pytest.raises(FetchError):
+        asyncio.run(engine(max_attempts=3).run(call))
+    assert len(attempts) == 3
+
+
+def test_spent_budget_stops_retries():
+    call, attempts = flaky(*[FetchError("unavailable", 503)] * 5)
+
+    with pytest.raises(FetchError):
+        asyncio.run(engine(budget=RetryBudget(min_retries=1)).run(call))
+    assert len(attempts) == 2
+
+
+def test_backoff_is_bounded_and_doubled_when_throttled():
+    retries = RetryEngine(base_delay=1.0, max_delay=5.0)
+
+    assert all(0 <= retries.backoff(1, SERVER) <= 2.0 for _ in range(100))
+    assert all(0 <= retries.backoff(1, THROTTLED) <= 4.0 for _ in range(100))
+    assert all(retries.backoff(10, SERVER) <= 5.0 for _ in range(100))
@@ -0,0 +1,77 @@
+import json
+
+import msgspec
+import pytest
+
+from components.models import Comment, Reply, Video
+from components.schemas import CommentItem, CommentResponse, ReplyResponse, SearchItem, SearchResponse, decode
+
+
+def test_search_items_are_decoded_leniently_and_bad_items_skipped():
+    body = json.dumps({
+        'status_code': 0,
+        'has_more': 1,
+        'cursor': None,
+        'extra': {'ignored': True},
+        'item_list': [
+            {'id': '1', 'createTime': '1700000000', 'author': {'uniqueId': 'a', 'verified': True},
+             'stats': {'playCount': '10', 'diggCount': 2}, 'textExtra': [{'hashtagName': 'fyp'}]},
+            {'id': '2'},
+            {'id': '3', 'author': {'uniqueId': 'b'}},
+        ],
+    }).encode()
+
+    data = decode(body, SearchResponse)
+
+    assert data['has_more'] == 1
+    assert data['cursor'] is None
+    assert 'extra' not in data
+    assert [item.id for item in data['item_list']] == ['1', '3']
+    assert all(isinstance(item, SearchItem) for item in data['item_list'])
+
+    video = Video.from_search_item(data['item_list'][0])
+    assert video.create_time == 1700000000
+    assert video.play_count == 10
+    assert video.hashtags == ['fyp']
+    assert video.author.unique_id == 'a'
+    assert video.author.verified is True
+
+
+def test_comment_items_build_models_directly():
+    body = json.dumps({
+        'comments': [{
+            'cid': '7001',
+            'text': 'nice',
+            'user': {'unique_id': 'creator', 'nickname': 'C'},
+            'reply_comment_total': 2,
+            'reply_comment': [{'cid': '7002', 'user': {'unique_id': 'fan'}, 'reply_to_reply_id': '0'}],
+        }],
+        'has_more': 0,
+        'cursor': 20,
+    }).encode()
+
+    items = decode(body, CommentResponse)['comments']
+    assert isinstance(items[0], CommentItem)
+
+    comment = Comment.from_item(items[0], 'creator')
+    assert comment.cid == '7001'
+    assert comment.reply_total == 2
+    assert comment.is_author_reply is True
+    assert comment.replies is None
+    assert [reply.cid for reply in comment.inline_replies] == ['7002']
+    assert comment.inline_replies[0].reply_to_reply_id == '0'
+    assert comment.inline_replies[0].is_author_reply is False
+
+
+def test_reply_items_build_models_directly():
+    body = b'{"comments": [{"cid": "9", "user": {"unique_id": "creator"}, "digg_count": "4"}], "has_more": 0}'
+
+    reply = Reply.from_item(decode(body, ReplyResponse)['comments'][0], 'creator')
+
+    assert reply.digg_count == 4
+    assert reply.is_author_reply is True
+
+
+def test_malformed_json_raises():
+    with pytest.raises(msgspec.DecodeError):
+        decode(b'{"item_list": [', SearchResponse)
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from components.singleflight import SingleFlight, request_key
+
+
+def test_request_key_ignores_param_order_value_type_and_host_case():
+    assert request_key('https://WWW.tiktok.com/api', {'a': 1, 'b': '2'}) == \
+        request_key('https://www.tiktok.com/api', {'b': 2, 'a': '1'})
+    assert request_key('https://www.tiktok.com/api', {'a': 1}) != request_key('https://www.tiktok.com/api', {'a': 2})
+    assert request_key('https://www.tiktok.com/api', None, 'x') != request_key('https://www.tiktok.com/api', None, 'y')
+
+
+def test_concurrent_identical_calls_run_once():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'ok': True}
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do('k', fetch) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert flight.coalesced == 4
+    assert all(result is results[0] for result in results)
+
+
+def test_nothing_is_kept_after_the_call_completes():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        flight = SingleFlight()
+        return await flight.do('k', fetch), await flight.do('k', fetch)
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_exception_is_shared_with_every_waiter():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do('k', fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_leaves_the_call_running_for_the_others():
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 'done'
+
+    async def main():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do('k', fetch))
+        second = asyncio.ensure_future(flight.do('k', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 'done'
+
+
+def test_call_is_cancelled_with_its_last_caller():
+    cancelled = []
+
+    async def fetch():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        flight = SingleFlight()
+        caller = asyncio.ensure_future(flight.do('k', fetch))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        return flight
+
+    flight = asyncio.run(main())
+
+    assert cancelled == [1]
+    assert flight._calls == {}
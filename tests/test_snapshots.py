@@ -0,0 +1,39 @@
+import asyncio
+
+from components.snapshots import CommentSnapshotStore
+
+
+def test_snapshots_round_trip_and_are_replaced(tmp_path):
+    path = str(tmp_path / "snapshots.sqlite")
+    comments = [{'cid': '1', 'reply_comment_total': 2, 'replies': [{'cid': '2'}]}]
+
+    async def main():
+        store = CommentSnapshotStore(path)
+        await store.put('7', 3, comments)
+        await store.put('7', 4, comments[:0])
+        store.close()
+        reopened = CommentSnapshotStore(path)
+        try:
+            return await reopened.get('7'), await reopened.get('missing')
+        finally:
+            reopened.close()
+
+    snapshot, missing = asyncio.run(main())
+    assert (snapshot.comment_count, snapshot.comments) == (4, [])
+    assert missing is None
+
+
+def test_stale_snapshots_are_pruned_on_open(tmp_path):
+    path = str(tmp_path / "snapshots.sqlite")
+
+    async def main():
+        store = CommentSnapshotStore(path)
+        await store.put('7', 1, [{'cid': '1'}])
+        store.close()
+        expired = CommentSnapshotStore(path, retention=-1)
+        try:
+            return await expired.get('7')
+        finally:
+            expired.close()
+
+    assert asyncio.run(main()) is None